@@ -1,4 +1,9 @@
 from .connection import Connection
+from .aio import AsyncConnection
+
+from .cache import BaseCache
+from .cache import MemoryCache
+from .cache import SQLiteCache
 
 from .constants import UNITED_STATES
 from .constants import EUROPE
@@ -12,11 +17,29 @@ from .enums import QUALITY
 from .enums import RACE_TO_FACTION
 from .enums import EXPANSION
 from .enums import RAIDS
+from .enums import CLASS_BY_NAME
+from .enums import RACE_BY_NAME
+from .enums import FACTION_RACES
+from .enums import EXPANSION_BY_SHORT
+from .enums import RAID_TO_EXPANSION
 
 from .exceptions import APIError
 from .exceptions import CharacterNotFound
 from .exceptions import GuildNotFound
 from .exceptions import RealmNotFound
+from .exceptions import RateLimitExceeded
+
+from .metadata import MetadataStore
+
+from .metrics import Metrics
+
+from .ratelimit import RateLimiter
+
+from .realms import RealmStatusPoller
+
+from .roster import RosterTracker
+
+from .tokens import TokenManager
 
 from .things import Thing
 from .things import LazyThing
@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from .connection import Connection
+from .exceptions import CharacterNotFound
+
+__all__ = ['AsyncConnection']
+
+
+def _mirror(name):
+    method = getattr(Connection, name)
+
+    @functools.wraps(method)
+    async def coroutine(self, *args, **kwargs):
+        return await self._run(getattr(self.connection, name), *args, **kwargs)
+
+    return coroutine
+
+
+class AsyncConnection(object):
+    """Coroutine flavour of :class:`Connection`.
+
+    Every ``get_*`` method of :class:`Connection` is available as a coroutine
+    (``get_characters`` as an asynchronous iterator).
+    Calls are dispatched to a pool of at most ``concurrency`` workers sharing a
+    single :class:`Connection`, and therefore a single pooled HTTP session per
+    region. Objects returned are regular models bound to that connection, so
+    their lazy properties keep working synchronously.
+    """
+
+    def __init__(self, client_id='', client_secret='', game='wow', locale=None,
+                 concurrency=10, connection=None):
+        self.connection = connection or Connection(client_id=client_id,
+            client_secret=client_secret, game=game, locale=locale, pool_size=concurrency)
+        self.concurrency = concurrency
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    make_request = _mirror('make_request')
+    get_character = _mirror('get_character')
+    get_guild = _mirror('get_guild')
+    get_all_realms = _mirror('get_all_realms')
+    get_realms = _mirror('get_realms')
+    get_realm = _mirror('get_realm')
+    get_guild_perks = _mirror('get_guild_perks')
+    get_guild_rewards = _mirror('get_guild_rewards')
+    get_character_classes = _mirror('get_character_classes')
+    get_character_races = _mirror('get_character_races')
+    get_item = _mirror('get_item')
+    get_spell = _mirror('get_spell')
+
+    async def get_characters(self, region, characters, fields=None, raw=False, cache=False):
+        """Asynchronous iterator flavour of :meth:`Connection.get_characters`.
+
+        Yields ``((realm, name), result)`` as requests complete, keeping at
+        most ``2 * concurrency`` of them queued.
+        """
+        characters = iter(characters)
+        futures = {}
+
+        def submit(count):
+            for realm, name in itertools.islice(characters, count):
+                future = self._run(self.connection.get_character, region, realm, name, fields=fields, raw=raw,
+                                   cache=cache)
+                futures[future] = (realm, name)
+
+        try:
+            submit(2 * self.concurrency)
+
+            while futures:
+                done, _ = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    key = futures.pop(future)
+                    submit(1)
+
+                    try:
+                        result = future.result()
+                    except CharacterNotFound as e:
+                        result = e
+
+                    yield key, result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def refresh(self, things, *fields):
+        """Refresh many lazy objects (characters, guilds) concurrently.
+
+        Typically used to load a field for a whole guild roster at once::
+
+            await connection.refresh([m['character'] for m in guild.members], Character.PROGRESSION)
+        """
+        things = list(things)
+        await asyncio.gather(*[self._run(thing.refresh, *fields) for thing in things])
+        return things
@@ -0,0 +1,269 @@
+import time
+import sqlite3
+import threading
+import collections
+from .codec import loads, dumps
+
+__all__ = ['BaseCache', 'MemoryCache', 'SQLiteCache', 'make_cache_key']
+
+
+def make_cache_key(region, game, path, params=None):
+    items = []
+    for k, v in sorted((params or {}).items()):
+        if not v:
+            continue
+        if isinstance(v, (list, tuple, set, frozenset)):
+            v = ','.join(sorted(map(str, v)))
+        items.append('%s=%s' % (k, v))
+
+    return '%s:%s:%s?%s' % (region, game, path, '&'.join(items))
+
+
+class BaseCache(object):
+    """Interface of the response caches used by :class:`Connection`.
+
+    ``ttl`` is the default lifetime of an entry in seconds (``None`` never
+    expires) and ``ttls`` maps path prefixes to more specific lifetimes, the
+    longest matching prefix winning.
+
+    Entries may carry ``etag`` and ``last_modified`` validators. Expired
+    entries holding validators are kept (until evicted) and returned by
+    :meth:`get_stale` so the connection can revalidate them with a
+    conditional request.
+    """
+
+    def __init__(self, ttl=None, ttls=None):
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_ttl(self, path):
+        match = None
+        for prefix in self.ttls:
+            if path.startswith(prefix) and (match is None or len(prefix) > len(match)):
+                match = prefix
+
+        if match is None:
+            return self.ttl
+
+        return self.ttls[match]
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def get_stale(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None, size=0, etag=None, last_modified=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+CacheEntry = collections.namedtuple('CacheEntry', ['value', 'expires', 'size', 'etag', 'last_modified'])
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache bounded in entries and (approximate) bytes."""
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, ttls=None):
+        super(MemoryCache, self).__init__(ttl, ttls)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry.expires is not None and entry.expires <= time.time():
+                if not (entry.etag or entry.last_modified):
+                    self._remove(key)
+                    self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry.value
+
+    def get_stale(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value, ttl=None, size=0, etag=None, last_modified=None):
+        expires = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = CacheEntry(value, expires, size, etag, last_modified)
+            self._bytes += size
+
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        stats = super(MemoryCache, self).stats()
+        stats.update({
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        })
+
+        return stats
+
+
+class SQLiteCache(BaseCache):
+    """Persistent cache stored in a SQLite database.
+
+    The database file can be shared by several processes (e.g. cron workers)
+    so static data survives restarts. Payloads are stored as JSON.
+    """
+
+    def __init__(self, path, max_entries=None, ttl=None, ttls=None, timeout=30):
+        super(SQLiteCache, self).__init__(ttl, ttls)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+
+        self._local = threading.local()
+
+        with self._connection() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS responses ('
+                       'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, size INTEGER, accessed REAL, '
+                       'etag TEXT, last_modified TEXT)')
+            db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+            columns = [row[1] for row in db.execute('PRAGMA table_info(responses)')]
+            for column in ('etag', 'last_modified'):
+                if column not in columns:
+                    db.execute('ALTER TABLE responses ADD COLUMN %s TEXT' % column)
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=self.timeout)
+            db.execute('PRAGMA journal_mode=WAL')
+
+        return db
+
+    def get(self, key):
+        db = self._connection()
+        row = db.execute('SELECT value, expires, etag, last_modified FROM responses WHERE key = ?',
+                         (key,)).fetchone()
+
+        if row is not None and row[1] is not None and row[1] <= time.time():
+            if not (row[2] or row[3]):
+                with db:
+                    db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.evictions += 1
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        if self.max_entries is not None:
+            with db:
+                db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+
+        self.hits += 1
+
+        return loads(row[0])
+
+    def get_stale(self, key):
+        row = self._connection().execute('SELECT value, expires, size, etag, last_modified FROM responses '
+                                         'WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        return CacheEntry(loads(row[0]), *row[1:])
+
+    def set(self, key, value, ttl=None, size=0, etag=None, last_modified=None):
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+
+        db = self._connection()
+        with db:
+            db.execute('INSERT OR REPLACE INTO responses (key, value, expires, size, accessed, etag, last_modified) '
+                       'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (key, dumps(value), expires, size, now, etag, last_modified))
+
+            if self.max_entries is not None:
+                evicted = db.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses '
+                                     'ORDER BY accessed DESC LIMIT -1 OFFSET ?)', (self.max_entries,)).rowcount
+                self.evictions += max(evicted, 0)
+
+    def delete(self, key):
+        db = self._connection()
+        with db:
+            db.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        db = self._connection()
+        with db:
+            db.execute('DELETE FROM responses')
+
+    def stats(self):
+        stats = super(SQLiteCache, self).stats()
+        stats.update({
+            'entries': len(self),
+            'bytes': self._connection().execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0],
+        })
+
+        return stats
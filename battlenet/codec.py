@@ -0,0 +1,94 @@
+import collections
+
+__all__ = ['BACKENDS', 'available_backends', 'get_backend', 'set_backend', 'loads', 'dumps']
+
+Backend = collections.namedtuple('Backend', ['name', 'loads', 'dumps'])
+
+
+def _orjson():
+    import orjson
+
+    return orjson.loads, lambda obj: orjson.dumps(obj).decode('utf-8')
+
+
+def _ujson():
+    import ujson
+
+    return ujson.loads, lambda obj: ujson.dumps(obj, escape_forward_slashes=False)
+
+
+def _simplejson():
+    import simplejson
+
+    return simplejson.loads, simplejson.dumps
+
+
+def _json():
+    import json
+
+    return json.loads, json.dumps
+
+
+# Fastest first, see benchmarks/json_decode.py
+BACKENDS = collections.OrderedDict([
+    ('orjson', _orjson),
+    ('ujson', _ujson),
+    ('simplejson', _simplejson),
+    ('json', _json),
+])
+
+_backends = {}
+
+
+def _load(name):
+    if name not in _backends:
+        _backends[name] = Backend(name, *BACKENDS[name]())
+
+    return _backends[name]
+
+
+def available_backends():
+    """Names of the installed backends, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _load(name)
+        except ImportError:
+            continue
+        names.append(name)
+
+    return names
+
+
+def get_backend():
+    return _backend.name
+
+
+def set_backend(name=None):
+    """Use the backend ``name``, or the fastest one installed when ``None``.
+
+    Raises ``ImportError`` if the backend is not installed.
+    """
+    global _backend
+
+    if name is None:
+        name = available_backends()[0]
+    elif name not in BACKENDS:
+        raise ValueError('Unknown JSON backend %r' % name)
+
+    _backend = _load(name)
+
+
+def loads(data):
+    """Decode a JSON document from ``bytes`` (UTF-8) or ``str``.
+
+    Invalid documents raise a ``ValueError`` whatever the backend.
+    """
+    return _backend.loads(data)
+
+
+def dumps(obj):
+    return _backend.dumps(obj)
+
+
+set_backend()
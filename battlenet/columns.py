@@ -0,0 +1,154 @@
+import collections
+from .enums import EXPANSION, RAID_ORDER
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['COLUMNS', 'DEFAULT_COLUMNS', 'DIFFICULTIES', 'required_fields', 'to_columns', 'to_records',
+           'progression_matrix']
+
+
+def _get(key):
+    return lambda character, member: character.get(key)
+
+
+def _item_level(key):
+    def extract(character, member):
+        items = character.get('items')
+        return items.get(key) if items else None
+
+    return extract
+
+
+def _boss_kills(character, member):
+    progression = character.get('progression')
+    if not progression:
+        return None
+
+    return sum(boss.get('lfrKills', 0) + boss.get('flexKills', 0) + boss.get('normalKills', 0) +
+               boss.get('heroicKills', 0) + boss.get('mythicKills', 0)
+               for raid in progression['raids'] for boss in raid['bosses'])
+
+
+def _rank(character, member):
+    return member.get('rank') if member else None
+
+
+# column name -> (extractor, dtype, missing value, character field needed)
+COLUMNS = {
+    'name': (_get('name'), 'U', '', None),
+    'realm': (_get('realm'), 'U', '', None),
+    'level': (_get('level'), 'int16', -1, None),
+    'class': (_get('class'), 'int8', -1, None),
+    'race': (_get('race'), 'int8', -1, None),
+    'gender': (_get('gender'), 'int8', -1, None),
+    'achievement_points': (_get('achievementPoints'), 'int32', -1, None),
+    'last_modified': (_get('lastModified'), 'int64', -1, None),
+    'rank': (_rank, 'int8', -1, None),
+    'item_level': (_item_level('averageItemLevel'), 'float32', float('nan'), 'items'),
+    'item_level_equipped': (_item_level('averageItemLevelEquipped'), 'float32', float('nan'), 'items'),
+    'boss_kills': (_boss_kills, 'int32', -1, 'progression'),
+}
+
+DEFAULT_COLUMNS = ('name', 'level', 'class', 'race', 'achievement_points')
+
+
+def required_fields(columns):
+    """Character fields that must be requested to fill ``columns``."""
+    fields = []
+    for column in columns:
+        field = COLUMNS[column][3]
+        if field and field not in fields:
+            fields.append(field)
+
+    return fields
+
+
+def to_columns(rows, columns=None):
+    """Build one typed array per column from raw JSON.
+
+    ``rows`` is an iterable of ``(character, member)`` pairs of raw payloads,
+    ``member`` being the guild roster entry (or ``None``). Returns a dict
+    mapping column names to NumPy arrays; missing values are filled with -1
+    (integers), NaN (floats) or an empty string.
+    """
+    if numpy is None:
+        raise ImportError('numpy is required for columnar exports')
+
+    columns = list(columns or DEFAULT_COLUMNS)
+    specs = [(column,) + COLUMNS[column] for column in columns]
+    values = dict((column, []) for column in columns)
+
+    for character, member in rows:
+        for column, extract, dtype, missing, field in specs:
+            value = extract(character, member)
+            values[column].append(missing if value is None else value)
+
+    return dict((column, numpy.array(values[column], dtype=dtype)) for column, _, dtype, _, _ in specs)
+
+
+def to_records(rows, columns=None):
+    """Same as :func:`to_columns` as a NumPy record array."""
+    columns = list(columns or DEFAULT_COLUMNS)
+    arrays = to_columns(rows, columns)
+
+    return numpy.rec.fromarrays([arrays[column] for column in columns], names=columns)
+
+
+DIFFICULTIES = ('lfr', 'flex', 'normal', 'heroic', 'mythic')
+
+BossIndex = collections.namedtuple('BossIndex', ['expansion', 'raid_id', 'raid_name', 'boss_id', 'boss_name'])
+Progression = collections.namedtuple('Progression', ['kills', 'bosses'])
+
+
+def progression_matrix(characters, expansions=None):
+    """Raid kill counts as a dense array shaped characters x bosses x difficulties.
+
+    ``characters`` are raw character payloads (or :class:`Character` objects)
+    loaded with the ``progression`` field. Bosses are ordered by expansion
+    then raid following :data:`EXPANSION` and :data:`RAIDS`, and described by
+    the returned ``bosses`` list of :class:`BossIndex`. Difficulties follow
+    :data:`DIFFICULTIES`. ``expansions`` restricts the bosses to the given
+    short expansion names (e.g. ``['bfa']``).
+    """
+    if numpy is None:
+        raise ImportError('numpy is required for progression matrices')
+
+    characters = [getattr(character, '_data', character) for character in characters]
+
+    raids = collections.OrderedDict()
+    for character in characters:
+        for raid in (character.get('progression') or {}).get('raids', []):
+            position, index, short = RAID_ORDER.get(raid['id'], (len(EXPANSION), 0, None))
+            if expansions is not None and short not in expansions:
+                continue
+
+            if raid['id'] not in raids:
+                raids[raid['id']] = ((position, index), short, raid['name'], collections.OrderedDict())
+
+            bosses = raids[raid['id']][3]
+            for boss in raid['bosses']:
+                boss_id = boss['id'] or boss['name']
+                if boss_id not in bosses:
+                    bosses[boss_id] = boss['name']
+
+    bosses = []
+    columns = {}
+    for raid_id, (_, short, raid_name, raid_bosses) in sorted(raids.items(), key=lambda item: item[1][0]):
+        for boss_id, boss_name in raid_bosses.items():
+            columns[(raid_id, boss_id)] = len(bosses)
+            bosses.append(BossIndex(short, raid_id, raid_name, boss_id, boss_name))
+
+    kills = numpy.zeros((len(characters), len(bosses), len(DIFFICULTIES)), dtype='int32')
+    keys = ['%sKills' % difficulty for difficulty in DIFFICULTIES]
+
+    for row, character in enumerate(characters):
+        for raid in (character.get('progression') or {}).get('raids', []):
+            for boss in raid['bosses']:
+                column = columns.get((raid['id'], boss['id'] or boss['name']))
+                if column is not None:
+                    kills[row, column] = [boss.get(key, 0) for key in keys]
+
+    return Progression(kills, bosses)
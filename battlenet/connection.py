@@ -2,33 +2,41 @@ import logging
 import base64
 import hmac
 import hashlib
+from email.utils import formatdate
 import time
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from .things import Character, Realm, Guild, Reward, Perk, Class, Race
-from .exceptions import APIError, CharacterNotFound, GuildNotFound, RealmNotFound
-from .utils import normalize
+from .exceptions import APIError, CharacterNotFound, GuildNotFound, RealmNotFound, RateLimitExceeded
+from .cache import MemoryCache, make_cache_key
+from .coalesce import SingleFlight
+from .realms import RealmIndex
+from .ratelimit import RateLimiter, retry_delay
+from .pool import PoolStats
+from .tokens import TokenManager, BearerAuth
+from .transport import HTTPTransport
+from .metrics import Metrics, Measure
+from .stream import iter_array
+from .codec import loads
+from .columns import required_fields, to_columns, to_records, progression_matrix
 from urllib.parse import quote
 import requests
-from oauthlib.oauth2 import BackendApplicationClient
-from requests_oauthlib import OAuth2Session
-
-try:
-    import simplejson as json
-except ImportError:
-    import json
-
 
 __all__ = ['Connection']
 
 URL_FORMAT = 'https://{region:s}.api.blizzard.com/{game:s}{path:s}'
-BNET_TOKEN_URL = 'https://{region:s}.battle.net/oauth/token'
 
 logging.basicConfig()
 logger = logging.getLogger('battlenet')
 ##logger.setLevel(logging.DEBUG)
 
-DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun',)
-MONTHS = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul',
-          'Aug', 'Sep', 'Oct', 'Nov', 'Dec',)
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+DEFAULT_REALM_TTL = 5 * 60
+DEFAULT_WORKERS = 10
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_POOL_SIZE = 10
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class Connection(object):
@@ -38,14 +46,30 @@ class Connection(object):
         'locale': 'en_US'
     }
 
-    def __init__(self, client_id='', client_secret='', game='wow', locale=None):
+    def __init__(self, client_id='', client_secret='', game='wow', locale=None, cache=None, coalesce=True,
+                 realm_ttl=DEFAULT_REALM_TTL, rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES,
+                 pool_size=DEFAULT_POOL_SIZE, pool_block=False, connect_retries=0,
+                 token_manager=None, transport=None, metrics=None):
         self.client_id = client_id or Connection.defaults.get('client_id')
         self.client_secret = client_secret or Connection.defaults.get('client_secret')
         self.game = game
         self.locale = locale or Connection.defaults.get('locale')
 
-        self._cache = {}
+        self.cache = cache if cache is not None else MemoryCache(ttl=DEFAULT_CACHE_TTL)
+        self.coalesce = coalesce
+        self.realms = RealmIndex(self, ttl=realm_ttl)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.connect_retries = connect_retries
+        self.pool_stats = PoolStats()
+        self.token_manager = token_manager or TokenManager.shared(self.client_id, self.client_secret)
+        self.transport = transport or HTTPTransport()
+        self.metrics = metrics if metrics is not None else Metrics()
         self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._flights = SingleFlight()
 
     def __eq__(self, other):
         if not isinstance(other, Connection):
@@ -65,172 +89,473 @@ class Connection(object):
         hash = hmac.new(private_key, string_to_sign, hashlib.sha1).digest()
         return base64.encodestring(hash).rstrip()
 
+    def _get_client(self, region):
+        with self._clients_lock:
+            if region not in self._clients:
+                self._clients[region] = self.transport.open(self, region)
+
+            return self._clients[region]
+
     def make_request(self, region, path, params=None, cache=False):
+        with Measure(self.metrics, region, path) as event:
+            return self._request(region, path, params, cache, event)
+
+    def _request(self, region, path, params, cache, event):
         params = params or {}
         params['locale'] = self.locale
 
-        now = time.gmtime()
-        date = '%s, %2d %s %d %2d:%02d:%02d GMT' % (DAYS[now[6]], now[2],
-            MONTHS[now[1]], now[0], now[3], now[4], now[5])
+        payload = {}
+        for k, v in params.items():
+            if v:
+                payload[k] = v
+
+        key = make_cache_key(region, self.game, path, payload)
+
+        if cache is not False and cache is not None:
+            data = self.cache.get(key)
+            if data is not None:
+                event.cache = 'hit'
+                return data
+
+            event.cache = 'miss'
+
+        if self.coalesce:
+            # Only the caller actually fetching resets the flag
+            event.coalesced = True
+            return self._flights.do(key, self._fetch, region, path, payload, cache, key, event)
+
+        return self._fetch(region, path, payload, cache, key, event)
+
+    def _model(self, event, build):
+        started = time.perf_counter()
+        result = build()
+        event.add('model', time.perf_counter() - started)
+
+        return result
+
+    def _fetch(self, region, path, payload, cache, key, event):
+        event.coalesced = False
+        headers = {}
+
+        use_cache = cache is not False and cache is not None
+        stale = None
+
+        if use_cache:
+            stale = self.cache.get_stale(key)
+            if stale is not None:
+                if stale.etag:
+                    headers['If-None-Match'] = stale.etag
+                if stale.last_modified:
+                    headers['If-Modified-Since'] = stale.last_modified
+
+        r = self._send(region, path, payload, event, headers)
+        event.bytes = len(r.content)
 
-        headers = {
-            'Date': date
-        }
+        if use_cache:
+            ttl = self.cache.get_ttl(path) if isinstance(cache, bool) else cache
 
+        if r.status_code == 304 and stale is not None:
+            self.cache.set(key, stale.value, ttl=ttl, size=stale.size,
+                           etag=stale.etag, last_modified=stale.last_modified)
+            event.cache = 'revalidated'
+            return stale.value
+
+        started = time.perf_counter()
+        try:
+            data = loads(r.content)
+        except ValueError:
+            raise APIError('Non-JSON Response')
+        event.add('decode', time.perf_counter() - started)
+
+        if use_cache:
+            last_modified = r.headers.get('Last-Modified')
+            if not last_modified and isinstance(data, dict) and data.get('lastModified'):
+                last_modified = formatdate(data['lastModified'] / 1000, usegmt=True)
+
+            self.cache.set(key, data, ttl=ttl, size=len(r.content),
+                           etag=r.headers.get('ETag'), last_modified=last_modified)
+
+        return data
+
+    def _send(self, region, path, payload, event, headers=None, stream=False):
         url = URL_FORMAT.format(
             region=region,
             game=self.game,
             path=path,
         )
 
-        if cache and url in self._cache:
-            return self._cache[url]
-
-        if region not in self._clients:
-            bnet_client = {
-                    'client_id': self.client_id,
-                    'client_secret': self.client_secret,
-            }
-            scope = ['wow.profile']
-            bnet_token_url = BNET_TOKEN_URL.format(region=region)
-
-            self._clients[region] = OAuth2Session(
-                    client=BackendApplicationClient(client_id=self.client_id, scope=scope),
-                    auto_refresh_url=bnet_token_url,
-                    auto_refresh_kwargs=bnet_client)
-            self._clients[region].fetch_token(
-                    token_url=bnet_token_url,
-                    client_id=self.client_id,
-                    client_secret=self.client_secret)
+        client = self._get_client(region)
+
+        auth = getattr(client, 'auth', None)
+        if isinstance(auth, BearerAuth):
+            # Get the token first so its latency is not counted in the round trip
+            started = time.perf_counter()
+            auth.token_manager.get_token(region)
+            event.add('token', time.perf_counter() - started)
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                started = time.perf_counter()
+                self.rate_limiter.acquire(self.client_id, region)
+                event.add('throttle', time.perf_counter() - started)
+
+            started = time.perf_counter()
+            r = client.get(url, params=payload, headers=headers or {}, stream=stream)
+            event.add('http', time.perf_counter() - started)
+            event.status = r.status_code
+
+            if r.status_code != 429:
+                break
+
+            # A streamed body is never read, release its pooled connection
+            r.close()
+
+            if attempt >= self.max_retries:
+                raise RateLimitExceeded('429 Too Many Requests: %s' % url, status_code=429)
+
+            delay = retry_delay(attempt, r.headers.get('Retry-After'))
+            logger.debug('Throttled on %s, retrying in %.2fs', url, delay)
+
+            started = time.perf_counter()
+            if self.rate_limiter:
+                self.rate_limiter.block(self.client_id, region, delay)
+            else:
+                time.sleep(delay)
+            event.add('throttle', time.perf_counter() - started)
+
+            attempt += 1
 
-        payload = {}
-        for k, v in params.items():
-            if v:
-                payload[k] = v
-        r = self._clients[region].get(url, params=payload)
         try:
             r.raise_for_status()
         except requests.exceptions.HTTPError as e:
-            raise APIError(str(e))
+            r.close()
+            raise APIError(str(e), status_code=r.status_code)
 
-        try:
-            data = r.json()
-        except ValueError:
-            raise APIError('Non-JSON Response')
+        return r
 
-        if cache:
-            self._cache[url] = data
+    def stream_request(self, region, path, key, params=None):
+        """Yield the elements of the top level array ``key`` of a response as they are downloaded.
 
-        return data
+        Unlike :meth:`make_request` the body is never fully buffered nor
+        parsed at once, nor cached. The metrics event is emitted once the
+        array is consumed, its ``total`` including the time spent by the caller.
+        """
+        params = params or {}
+        params['locale'] = self.locale
 
-    def get_character(self, region, realm, name, fields=None, raw=False):
+        payload = {}
+        for k, v in params.items():
+            if v:
+                payload[k] = v
+
+        with Measure(self.metrics, region, path) as event:
+            r = self._send(region, path, payload, event, stream=True)
+            event.bytes = 0
+            try:
+                started = time.perf_counter()
+                for value in iter_array(self._iter_chunks(r, event), key):
+                    event.add('decode', time.perf_counter() - started)
+                    yield value
+                    started = time.perf_counter()
+                event.add('decode', time.perf_counter() - started)
+            except ValueError:
+                raise APIError('Non-JSON Response')
+            finally:
+                r.close()
+
+    def _iter_chunks(self, r, event):
+        chunks = r.iter_content(STREAM_CHUNK_SIZE)
+
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            elapsed = time.perf_counter() - started
+
+            # Reading the body counts as http, not as decoding
+            event.add('http', elapsed)
+            event.add('decode', -elapsed)
+
+            if chunk is None:
+                return
+
+            event.bytes += len(chunk)
+            yield chunk
+
+    def get_character(self, region, realm, name, fields=None, raw=False, cache=False):
         name = quote(name.lower())
         realm = quote(realm.lower()).replace("%20", '-')
 
-        try:
-            data = self.make_request(region, '/character/%s/%s' % (realm, name), {'fields': fields})
-            if not data:
-                raise CharacterNotFound
-
-            if raw:
-                return data
+        path = '/character/%s/%s' % (realm, name)
 
-            return Character(region, data=data, connection=self)
-        except APIError:
-            raise CharacterNotFound
+        try:
+            with Measure(self.metrics, region, path) as event:
+                data = self._request(region, path, {'fields': fields}, cache, event)
+                if not data:
+                    raise CharacterNotFound
+
+                if raw:
+                    return data
+
+                return self._model(event, lambda: Character(region, data=data, connection=self))
+        except RateLimitExceeded:
+            raise
+        except APIError as e:
+            raise CharacterNotFound(str(e), status_code=e.status_code)
+
+    def get_characters(self, region, characters, fields=None, raw=False, cache=False, workers=DEFAULT_WORKERS):
+        """Fetch many characters in parallel.
+
+        ``characters`` is an iterable of ``(realm, name)`` pairs. Yields
+        ``((realm, name), result)`` as requests complete, where ``result`` is
+        the character or the :class:`CharacterNotFound` raised for it.
+
+        At most ``2 * workers`` requests are queued at a time, and those not
+        started yet are cancelled when the caller stops iterating early.
+        """
+        characters = iter(characters)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {}
+
+        def submit(count):
+            for realm, name in itertools.islice(characters, count):
+                future = executor.submit(self.get_character, region, realm, name, fields=fields, raw=raw, cache=cache)
+                futures[future] = (realm, name)
 
-    def get_guild(self, region, realm, name, fields=None, raw=False):
+        try:
+            submit(2 * workers)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    key = futures.pop(future)
+                    submit(1)
+
+                    try:
+                        result = future.result()
+                    except CharacterNotFound as e:
+                        result = e
+
+                    yield key, result
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def characters_to_columns(self, region, characters, columns=None, records=False, workers=DEFAULT_WORKERS):
+        """Fetch ``(realm, name)`` characters and return their data as NumPy arrays.
+
+        The character fields needed by ``columns`` are requested automatically
+        and no :class:`Character` is built. Characters that cannot be found
+        are left out.
+        """
+        fields = required_fields(columns or [])
+
+        rows = [(data, None) for _, data in self.get_characters(region, characters, fields=fields, raw=True,
+                                                                 workers=workers)
+                if not isinstance(data, CharacterNotFound)]
+
+        return to_records(rows, columns) if records else to_columns(rows, columns)
+
+    def progression_matrix(self, region, characters, expansions=None, workers=DEFAULT_WORKERS):
+        """Fetch the progression of ``(realm, name)`` characters as a kill count matrix.
+
+        Returns ``(names, progression)`` where ``names`` lists the ``(realm, name)``
+        pairs found, in the row order of ``progression.kills``; see
+        :func:`battlenet.columns.progression_matrix`.
+        """
+        names, payloads = [], []
+        for key, data in self.get_characters(region, characters, fields=[Character.PROGRESSION], raw=True,
+                                             workers=workers):
+            if not isinstance(data, CharacterNotFound):
+                names.append(key)
+                payloads.append(data)
+
+        return names, progression_matrix(payloads, expansions)
+
+    def prefetch(self, things, fields=None, members=None, realms=False, workers=DEFAULT_WORKERS):
+        """Load the fields a graph of objects will need with as few requests as possible.
+
+        ``things`` is a :class:`Guild`, a :class:`Character` or an iterable of
+        them, and ``fields`` the fields to load on each of them. ``members``
+        lists the fields to load on the characters of every guild's roster
+        (the roster itself is loaded when missing). With ``realms`` every
+        object gets its realm resolved from the realm index.
+
+        Only missing fields are requested, one request per object, in
+        parallel on ``workers`` threads. Objects that cannot be found are left
+        untouched.
+        """
+        if isinstance(things, (Character, Guild)):
+            things = [things]
+        things = list(things)
+
+        guild_fields = list(fields or [])
+        if members is not None and Guild.MEMBERS not in guild_fields:
+            guild_fields.append(Guild.MEMBERS)
+
+        guilds = [thing for thing in things if isinstance(thing, Guild)]
+        characters = [thing for thing in things if isinstance(thing, Character)]
+
+        self._refresh_many([(guild, guild_fields) for guild in guilds] +
+                           [(character, fields or []) for character in characters], workers)
+
+        if members:
+            # Guilds whose roster could not be loaded would fetch it again lazily
+            roster = [member['character'] for guild in guilds if Guild.MEMBERS in guild._data
+                      for member in guild.members]
+            self._refresh_many([(character, members) for character in roster], workers)
+            characters.extend(roster)
+
+        if realms:
+            resolved = {}
+            for thing in guilds + characters:
+                key = (thing.region, thing._data['realm'])
+                if key not in resolved:
+                    data = self.realms.get(*key)
+                    resolved[key] = Realm(thing.region, data=data, connection=self) if data else None
+
+                if resolved[key] is not None:
+                    thing._realm = resolved[key]
+
+        return things
+
+    def _refresh_many(self, jobs, workers):
+        jobs = [(thing, [field for field in fields if field not in thing._data]) for thing, fields in jobs]
+        jobs = [(thing, missing) for thing, missing in jobs if missing]
+
+        if not jobs:
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(thing.refresh, *missing) for thing, missing in jobs]
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except (CharacterNotFound, GuildNotFound) as e:
+                    logger.debug('Prefetch skipped: %s', e)
+
+    def get_guild(self, region, realm, name, fields=None, raw=False, cache=False):
         name = quote(name.lower())
         realm = quote(realm.lower()).replace("%20", '-')
 
+        path = '/guild/%s/%s' % (realm, name)
+
         try:
-            data = self.make_request(region, '/guild/%s/%s' % (realm, name), {'fields': fields})
+            with Measure(self.metrics, region, path) as event:
+                data = self._request(region, path, {'fields': fields}, cache, event)
 
-            if raw:
-                return data
+                if raw:
+                    return data
 
-            return Guild(region, data=data, connection=self)
-        except APIError:
-            raise GuildNotFound
+                return self._model(event, lambda: Guild(region, data=data, connection=self))
+        except RateLimitExceeded:
+            raise
+        except APIError as e:
+            raise GuildNotFound(str(e), status_code=e.status_code)
 
-    def get_all_realms(self, region, raw=False):
-        data = self.make_request(region, '/realm/status')
+    def iter_guild_members(self, region, realm, name, raw=False):
+        """Stream a guild roster, yielding ``{'character': ..., 'rank': ...}`` entries one by one."""
+        path = '/guild/%s/%s' % (quote(realm.lower()).replace("%20", '-'), quote(name.lower()))
 
-        if raw:
-            return data['realms']
+        try:
+            for member in self.stream_request(region, path, Guild.MEMBERS, {'fields': [Guild.MEMBERS]}):
+                if not raw:
+                    member['character'] = Character(region, data=member['character'], connection=self)
+                yield member
+        except RateLimitExceeded:
+            raise
+        except APIError as e:
+            raise GuildNotFound(str(e), status_code=e.status_code)
+
+    def get_all_realms(self, region, raw=False, cache=False):
+        with Measure(self.metrics, region, '/realm/status') as event:
+            data = self._request(region, '/realm/status', None, cache, event)
 
-        return [Realm(region, data=realm, connection=self) for realm in data['realms']]
+            if raw:
+                return data['realms']
 
-    def get_realms(self, region, names, raw=False):
-        data = self.make_request(region, '/realm/status', {'realms': ','.join(map(quote, names))})
+            return self._model(event, lambda: [Realm(region, data=realm, connection=self) for realm in data['realms']])
 
-        if raw:
-            return data['realms']
+    def iter_all_realms(self, region, raw=False):
+        for realm in self.stream_request(region, '/realm/status', 'realms'):
+            yield realm if raw else Realm(region, data=realm, connection=self)
+
+    def get_realms(self, region, names, raw=False, cache=False):
+        with Measure(self.metrics, region, '/realm/status') as event:
+            data = self._request(region, '/realm/status', {'realms': ','.join(map(quote, names))}, cache, event)
 
-        return [Realm(region, data=realm, connection=self) for realm in data['realms']]
+            if raw:
+                return data['realms']
+
+            return self._model(event, lambda: [Realm(region, data=realm, connection=self) for realm in data['realms']])
 
     def get_realm(self, region, name, raw=False):
-        data = self.make_request(region, '/realm/status', {'realm': quote(name.lower())})
-        data = [d for d in data['realms'] if normalize(d['name']).lower() == normalize(name).lower()]
+        data = self.realms.get(region, name)
 
-        if len(data) != 1:
+        if data is None:
             raise RealmNotFound
 
         if raw:
-            return data[0]
+            return data
 
-        return Realm(self, region, data=data[0], connection=self)
+        return Realm(region, data=data, connection=self)
 
     def get_guild_perks(self, region, raw=False):
-        data = self.make_request(region, '/data/guild/perks', cache=True)
-        perks = data['perks']
+        with Measure(self.metrics, region, '/data/guild/perks') as event:
+            perks = self._request(region, '/data/guild/perks', None, True, event)['perks']
 
-        if raw:
-            return perks
+            if raw:
+                return perks
 
-        return [Perk(region, perk) for perk in perks]
+            return self._model(event, lambda: [Perk(region, perk) for perk in perks])
 
     def get_guild_rewards(self, region, raw=False):
-        data = self.make_request(region, '/data/guild/rewards', cache=True)
-        rewards = data['rewards']
+        with Measure(self.metrics, region, '/data/guild/rewards') as event:
+            rewards = self._request(region, '/data/guild/rewards', None, True, event)['rewards']
 
-        if raw:
-            return rewards
+            if raw:
+                return rewards
 
-        return [Reward(region, reward) for reward in rewards]
+            return self._model(event, lambda: [Reward(region, reward) for reward in rewards])
 
     def get_character_classes(self, region, raw=False):
-        data = self.make_request(region, '/data/character/classes', cache=True)
-        classes = data['classes']
+        with Measure(self.metrics, region, '/data/character/classes') as event:
+            classes = self._request(region, '/data/character/classes', None, True, event)['classes']
 
-        if raw:
-            return classes
+            if raw:
+                return classes
 
-        return [Class(class_) for class_ in classes]
+            return self._model(event, lambda: [Class(class_) for class_ in classes])
 
     def get_character_races(self, region, raw=False):
-        data = self.make_request(region, '/data/character/races', cache=True)
-        races = data['races']
+        with Measure(self.metrics, region, '/data/character/races') as event:
+            races = self._request(region, '/data/character/races', None, True, event)['races']
 
-        if raw:
-            return races
+            if raw:
+                return races
 
-        return [Race(race) for race in races]
+            return self._model(event, lambda: [Race(race) for race in races])
 
-    def get_item(self, region, item_id, raw=False, context=None, params=None):
-        url = '/item/%d' % item_id
-        if context:
-            url = '%s/%s' % (url, context)
-        data = self.make_request(region, url, params=params)
-        if 'name' not in data:
-            return self.get_item(region, item_id, raw=raw, context=data['availableContexts'][0], params=params)
-        return data
+    def get_item(self, region, item_id, raw=False, context=None, params=None, cache=False):
+        return self._get_with_context(region, '/item/%d' % item_id, context, params=params, cache=cache)[0]
 
-    def get_spell(self, region, spell_id, raw=False, context=None):
-        url = '/spell/%d' % spell_id
-        if context:
-            url = '%s/%s' % (url, context)
-        data = self.make_request(region, url)
-        if 'name' not in data:
-            return self.get_spell(region, spell_id, raw=raw, context=data['availableContexts'][0])
-        return data
+    def get_spell(self, region, spell_id, raw=False, context=None, cache=False):
+        return self._get_with_context(region, '/spell/%d' % spell_id, context, cache=cache)[0]
+
+    def _get_with_context(self, region, path, context=None, params=None, cache=False):
+        """Fetch an item or spell, returning ``(data, context)``.
+
+        Some ids can only be fetched within a context: when none is given
+        and the response has no ``name``, the first available context is
+        used.
+        """
+        while True:
+            data = self.make_request(region, '%s/%s' % (path, context) if context else path, params=params,
+                                     cache=cache)
+            if 'name' in data:
+                return data, context
+
+            context = data['availableContexts'][0]
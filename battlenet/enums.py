@@ -1,3 +1,5 @@
+import sys
+
 RACE = {
     1: 'Human',
     2: 'Orc',
@@ -98,3 +100,42 @@ RAIDS = {
     'legion': (8026, 8440, 8025, 8524, 8638),
     'bfa': (9389, 8670, 10057, 10425, 10522),
 }
+
+
+def _intern(mapping):
+    for key, value in mapping.items():
+        if isinstance(value, tuple):
+            mapping[key] = tuple(sys.intern(item) for item in value)
+        else:
+            mapping[key] = sys.intern(value)
+
+
+for _mapping in (RACE, CLASS, QUALITY, RACE_TO_FACTION, EXPANSION):
+    _intern(_mapping)
+
+# Reverse lookups. Several race ids share a name (Pandaren), hence tuples.
+CLASS_BY_NAME = dict((name, id_) for id_, name in CLASS.items())
+
+RACE_BY_NAME = {}
+for _id, _name in sorted(RACE.items()):
+    RACE_BY_NAME[_name] = RACE_BY_NAME.get(_name, ()) + (_id,)
+
+FACTION_RACES = {}
+for _id, _faction in sorted(RACE_TO_FACTION.items()):
+    FACTION_RACES[_faction] = FACTION_RACES.get(_faction, ()) + (_id,)
+
+EXPANSION_BY_SHORT = dict((short, (position, name)) for position, (short, name) in EXPANSION.items())
+
+# raid id -> (short expansion name, expansion name)
+RAID_TO_EXPANSION = {}
+
+# raid id -> (expansion position, raid position in the expansion, short expansion name)
+RAID_ORDER = {}
+
+for _short, _ids in RAIDS.items():
+    _position, _name = EXPANSION_BY_SHORT[_short]
+    for _index, _id in enumerate(_ids):
+        RAID_TO_EXPANSION[_id] = (sys.intern(_short), _name)
+        RAID_ORDER[_id] = (_position, _index, sys.intern(_short))
+
+del _mapping, _id, _name, _faction, _short, _ids, _position, _index
@@ -1,5 +1,8 @@
 class APIError(Exception):
-    pass
+    def __init__(self, message='', status_code=None):
+        super(APIError, self).__init__(message)
+
+        self.status_code = status_code
 
 class CharacterNotFound(APIError):
     pass
@@ -9,3 +12,6 @@ class GuildNotFound(APIError):
 
 class RealmNotFound(APIError):
     pass
+
+class RateLimitExceeded(APIError):
+    pass
@@ -0,0 +1,130 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .cache import MemoryCache, SQLiteCache, make_cache_key
+from .coalesce import SingleFlight
+from .connection import DEFAULT_WORKERS
+from .exceptions import APIError, RateLimitExceeded
+
+__all__ = ['MetadataStore']
+
+logger = logging.getLogger('battlenet')
+
+DEFAULT_MAX_ENTRIES = 50000
+
+ITEM = '/item/%d'
+SPELL = '/spell/%d'
+
+
+class MetadataStore(object):
+    """Local store of item and spell payloads.
+
+    Payloads are kept per locale of ``connection`` and with the context they
+    were resolved with, so ids that need a context are only resolved once.
+    Lookups are answered from memory (at most ``max_entries`` payloads), then
+    from the SQLite database at ``path`` when given, which survives restarts,
+    and only then from the API. Payloads never expire unless a ``ttl`` is
+    given.
+    """
+
+    def __init__(self, connection, path=None, max_entries=DEFAULT_MAX_ENTRIES, ttl=None):
+        self.connection = connection
+        self.memory = MemoryCache(max_entries=max_entries, ttl=ttl)
+        self.disk = SQLiteCache(path, ttl=ttl) if path else None
+
+        self._flights = SingleFlight()
+
+    def _key(self, region, path, context, params):
+        return make_cache_key(region, self.connection.game, path,
+                              dict(params or {}, context=context, locale=self.connection.locale))
+
+    def _cached(self, key):
+        entry = self.memory.get(key)
+
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry, ttl=self.memory.ttl)
+
+        return entry
+
+    def _store(self, key, entry):
+        self.memory.set(key, entry, ttl=self.memory.ttl)
+
+        if self.disk is not None:
+            self.disk.set(key, entry, ttl=self.disk.ttl)
+
+    def lookup(self, region, path, context=None, params=None):
+        """Payload of ``path`` (e.g. ``/item/18803``) as ``(data, context)``."""
+        key = self._key(region, path, context, params)
+
+        entry = self._cached(key)
+        if entry is None:
+            entry = self._flights.do(key, self._fetch, region, path, context, params, key)
+
+        return entry['data'], entry['context']
+
+    def _fetch(self, region, path, context, params, key):
+        data, resolved = self.connection._get_with_context(region, path, context, params=params)
+        entry = {'data': data, 'context': resolved}
+
+        self._store(key, entry)
+        if resolved != context:
+            self._store(self._key(region, path, resolved, params), entry)
+
+        return entry
+
+    def get_item(self, region, item_id, context=None, params=None):
+        return self.lookup(region, ITEM % item_id, context, params)[0]
+
+    def get_spell(self, region, spell_id, context=None):
+        return self.lookup(region, SPELL % spell_id, context)[0]
+
+    def _preload(self, region, path, ids, workers):
+        results = {}
+        missing = []
+        for id_ in dict.fromkeys(ids):
+            entry = self._cached(self._key(region, path % id_, None, None))
+            if entry is None:
+                missing.append(id_)
+            else:
+                results[id_] = entry['data']
+
+        def load(id_):
+            try:
+                return self.lookup(region, path % id_)[0]
+            except RateLimitExceeded:
+                raise
+            except APIError as e:
+                logger.debug('Could not preload %s: %s', path % id_, e)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for id_, data in zip(missing, executor.map(load, missing)):
+                    if data is not None:
+                        results[id_] = data
+
+        return results
+
+    def preload_items(self, region, item_ids, workers=DEFAULT_WORKERS):
+        """Fetch the items not stored yet in parallel and return ``{id: data}`` for all of them.
+
+        Items which cannot be found are left out.
+        """
+        return self._preload(region, ITEM, item_ids, workers)
+
+    def preload_spells(self, region, spell_ids, workers=DEFAULT_WORKERS):
+        return self._preload(region, SPELL, spell_ids, workers)
+
+    def preload_equipment(self, characters, workers=DEFAULT_WORKERS):
+        """Preload the items equipped by ``characters`` (loaded with the ``items`` field)."""
+        by_region = {}
+        for character in characters:
+            items = character._data.get('items') or {}
+            ids = by_region.setdefault(character.region, [])
+            ids.extend(item['id'] for item in items.values() if isinstance(item, dict) and 'id' in item)
+
+        results = {}
+        for region, ids in by_region.items():
+            results.update(self.preload_items(region, ids, workers))
+
+        return results
@@ -0,0 +1,213 @@
+import re
+import time
+import functools
+import logging
+import threading
+import collections
+
+__all__ = ['Metrics', 'RequestEvent', 'RollingHistogram', 'path_template']
+
+logger = logging.getLogger('battlenet')
+
+TEMPLATES = [
+    (re.compile(r'^/character/[^/]+/[^/]+$'), '/character/{realm}/{name}'),
+    (re.compile(r'^/guild/[^/]+/[^/]+$'), '/guild/{realm}/{name}'),
+    (re.compile(r'^/item/\d+$'), '/item/{id}'),
+    (re.compile(r'^/item/\d+/[^/]+$'), '/item/{id}/{context}'),
+    (re.compile(r'^/spell/\d+$'), '/spell/{id}'),
+    (re.compile(r'^/spell/\d+/[^/]+$'), '/spell/{id}/{context}'),
+]
+
+
+@functools.lru_cache(maxsize=4096)
+def path_template(path):
+    """Group paths by endpoint, e.g. ``/character/{realm}/{name}``."""
+    for pattern, template in TEMPLATES:
+        if pattern.match(path):
+            return template
+
+    return path
+
+
+class RequestEvent(object):
+    """What happened during one API call, passed to the :class:`Metrics` hooks.
+
+    ``cache`` is ``'hit'``, ``'miss'``, ``'revalidated'`` (304) or ``None``
+    when the call did not use the cache, and ``coalesced`` tells the result
+    was shared with an identical request in flight. ``timings`` maps phases
+    (``token``, ``throttle``, ``http``, ``decode``, ``model``) to seconds;
+    ``total`` is the whole call.
+    """
+    __slots__ = ('region', 'path', 'status', 'bytes', 'cache', 'coalesced', 'error', 'timings', 'total',
+                 '_started')
+
+    def __init__(self, region, path):
+        self.region = region
+        self.path = path
+        self.status = None
+        self.bytes = None
+        self.cache = None
+        self.coalesced = False
+        self.error = None
+        self.timings = {}
+        self.total = None
+
+    def __repr__(self):
+        return '<%s: %s %s %s>' % (self.__class__.__name__, self.region, self.path, self.status)
+
+    def add(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+
+class Measure(object):
+    """Times a call and hands its :class:`RequestEvent` to ``metrics`` when done."""
+    __slots__ = ('metrics', 'event')
+
+    def __init__(self, metrics, region, path):
+        self.metrics = metrics
+        self.event = RequestEvent(region, path_template(path))
+
+    def __enter__(self):
+        self.event._started = time.perf_counter()
+        return self.event
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event = self.event
+        event.total = time.perf_counter() - event._started
+
+        # A generator closed early (GeneratorExit) is not an error
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            event.error = exc_type.__name__
+            if event.status is None:
+                event.status = getattr(exc_value, 'status_code', None)
+
+        if self.metrics:
+            self.metrics.emit(event)
+
+
+def _percentile(samples, percent):
+    if not samples:
+        return None
+
+    return samples[min(int(len(samples) * percent / 100.0), len(samples) - 1)]
+
+
+class RollingHistogram(object):
+    """Distribution of the latest ``size`` samples of a measure."""
+
+    def __init__(self, size=1024):
+        self.count = 0
+        self._samples = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def _sorted(self):
+        with self._lock:
+            return sorted(self._samples)
+
+    def add(self, value):
+        with self._lock:
+            self.count += 1
+            self._samples.append(value)
+
+    def percentile(self, percent):
+        return _percentile(self._sorted(), percent)
+
+    def snapshot(self):
+        samples = self._sorted()
+        if not samples:
+            return {'count': self.count}
+
+        return {
+            'count': self.count,
+            'mean': sum(samples) / float(len(samples)),
+            'p50': _percentile(samples, 50),
+            'p90': _percentile(samples, 90),
+            'p99': _percentile(samples, 99),
+            'max': samples[-1],
+        }
+
+
+class Metrics(object):
+    """Collects the :class:`RequestEvent` of a connection.
+
+    Every event is passed to the callables in ``hooks`` (errors raised by a
+    hook are logged, not propagated) and its latencies and size are added to
+    rolling histograms, one per endpoint and measure (the phases, ``total``
+    and ``bytes``) over the latest ``window`` requests.
+    """
+
+    def __init__(self, window=1024, hooks=None):
+        self.window = window
+        self.hooks = list(hooks or [])
+
+        self.requests = 0
+        self.errors = 0
+        self.hits = 0
+
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def _add(self, path, measure, value):
+        key = (path, measure)
+        if key not in self._histograms:
+            self._histograms[key] = RollingHistogram(self.window)
+        self._histograms[key].add(value)
+
+    def emit(self, event):
+        with self._lock:
+            self.requests += 1
+            if event.error:
+                self.errors += 1
+            if event.cache == 'hit':
+                self.hits += 1
+
+            self._add(event.path, 'total', event.total)
+            for phase, seconds in event.timings.items():
+                self._add(event.path, phase, seconds)
+            if event.bytes is not None:
+                self._add(event.path, 'bytes', event.bytes)
+
+        for hook in list(self.hooks):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception('Metrics hook %r failed', hook)
+
+    def histogram(self, path, measure='total'):
+        """Histogram of ``measure`` for the endpoint ``path`` (a template or a concrete path)."""
+        return self._histograms.get((path_template(path), measure))
+
+    def summary(self):
+        """Snapshots of every histogram as ``{path: {measure: snapshot}}``."""
+        with self._lock:
+            histograms = list(self._histograms.items())
+
+        summary = {}
+        for (path, measure), histogram in histograms:
+            summary.setdefault(path, {})[measure] = histogram.snapshot()
+
+        return summary
+
+    def slowest(self, count=10, measure='total', percent=90):
+        """The ``count`` endpoints with the highest ``percent`` percentile of ``measure``."""
+        with self._lock:
+            histograms = [(path, histogram) for (path, name), histogram in self._histograms.items()
+                          if name == measure]
+
+        values = [(path, histogram.percentile(percent)) for path, histogram in histograms]
+
+        return sorted(values, key=lambda value: value[1], reverse=True)[:count]
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.errors = self.hits = 0
+            self._histograms.clear()
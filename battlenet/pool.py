@@ -0,0 +1,107 @@
+import time
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+__all__ = ['PoolStats', 'PooledAdapter']
+
+
+class PoolStats(object):
+    """Counters shared by the connection pools of a :class:`PooledAdapter`."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.in_use = 0
+        self.wait_time = 0.0
+
+        self._pools = []
+        self._lock = threading.Lock()
+
+    def add_pool(self, pool):
+        with self._lock:
+            self._pools.append(pool)
+
+    def checkout(self, wait):
+        with self._lock:
+            self.requests += 1
+            self.in_use += 1
+            self.wait_time += wait
+
+    def checkin(self):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def connect(self):
+        with self._lock:
+            self.connections += 1
+
+    def idle(self):
+        with self._lock:
+            pools = list(self._pools)
+
+        return sum(1 for pool in pools if pool.pool is not None
+                   for conn in list(pool.pool.queue) if conn is not None)
+
+    def stats(self):
+        requests = self.requests
+
+        return {
+            'requests': requests,
+            'connections': self.connections,
+            'open': self.in_use + self.idle(),
+            'in_use': self.in_use,
+            'reuse_ratio': 1.0 - float(self.connections) / requests if requests else 0.0,
+            'wait_time': self.wait_time,
+            'average_wait': self.wait_time / requests if requests else 0.0,
+        }
+
+
+def _instrument(pool_cls, stats):
+    class InstrumentedPool(pool_cls):
+        def __init__(self, *args, **kwargs):
+            super(InstrumentedPool, self).__init__(*args, **kwargs)
+            stats.add_pool(self)
+
+        def _get_conn(self, timeout=None):
+            started = time.monotonic()
+            conn = super(InstrumentedPool, self)._get_conn(timeout)
+            stats.checkout(time.monotonic() - started)
+            return conn
+
+        def _put_conn(self, conn):
+            stats.checkin()
+            return super(InstrumentedPool, self)._put_conn(conn)
+
+        def _new_conn(self):
+            stats.connect()
+            return super(InstrumentedPool, self)._new_conn()
+
+    InstrumentedPool.__name__ = 'Instrumented%s' % pool_cls.__name__
+
+    return InstrumentedPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTP adapter with a configurable keep-alive pool that records statistics.
+
+    ``pool_maxsize`` is the number of connections kept alive per host; it
+    should be at least the number of threads issuing requests, otherwise
+    surplus connections are discarded and re-established (with a new TLS
+    handshake) on the next request. With ``pool_block`` callers wait for a
+    free connection instead.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0, pool_block=False, stats=None):
+        self.stats = stats or PoolStats()
+
+        super(PooledAdapter, self).__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                            max_retries=max_retries, pool_block=pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super(PooledAdapter, self).init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _instrument(HTTPConnectionPool, self.stats),
+            'https': _instrument(HTTPSConnectionPool, self.stats),
+        }
@@ -0,0 +1,118 @@
+import time
+import random
+import datetime
+import threading
+from email.utils import parsedate_to_datetime
+
+__all__ = ['TokenBucket', 'RateLimiter', 'retry_delay']
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((when - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_delay(attempt, retry_after=None, base=0.5, cap=30.0):
+    """Delay before retry number ``attempt`` (starting at 0).
+
+    Exponential backoff with full jitter, never shorter than the server's
+    ``Retry-After`` when one was given.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+
+    retry_after = parse_retry_after(retry_after)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+
+    return delay
+
+
+class TokenBucket(object):
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_time(self):
+        now = time.monotonic()
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                wait = self._wait_time()
+
+            if not wait:
+                return
+
+            time.sleep(wait)
+
+    def block(self, seconds):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class RateLimiter(object):
+    """Client side throttling per ``(client_id, region)``.
+
+    Defaults match the documented Battle.net API quotas of 100 requests per
+    second and 36,000 requests per hour. A limiter can be shared by several
+    connections using the same credentials.
+    """
+
+    def __init__(self, per_second=100, per_hour=36000):
+        self.per_second = per_second
+        self.per_hour = per_hour
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_buckets(self, client_id, region):
+        key = (client_id, region)
+
+        with self._lock:
+            if key not in self._buckets:
+                buckets = []
+                if self.per_second:
+                    buckets.append(TokenBucket(self.per_second))
+                if self.per_hour:
+                    buckets.append(TokenBucket(self.per_hour / 3600.0, self.per_hour))
+
+                self._buckets[key] = buckets
+
+            return self._buckets[key]
+
+    def acquire(self, client_id, region):
+        for bucket in self._get_buckets(client_id, region):
+            bucket.acquire()
+
+    def block(self, client_id, region, seconds):
+        for bucket in self._get_buckets(client_id, region):
+            bucket.block(seconds)
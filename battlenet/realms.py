@@ -0,0 +1,213 @@
+import time
+import asyncio
+import logging
+import threading
+import collections
+from .utils import normalize
+
+__all__ = ['RealmIndex', 'RealmStatusPoller', 'RealmChange']
+
+logger = logging.getLogger('battlenet')
+
+
+def _realm_key(name):
+    return normalize(name).lower()
+
+
+class RealmIndex(object):
+    """Per region lookup table of realms keyed by slug and normalized name.
+
+    The table is built from a single ``/realm/status`` request and rebuilt
+    once it is older than ``ttl`` seconds.
+    """
+
+    def __init__(self, connection, ttl=300):
+        self.connection = connection
+        self.ttl = ttl
+
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _build(self, realms):
+        index = {}
+        for realm in realms:
+            index[realm['slug']] = realm
+            index[_realm_key(realm['name'])] = realm
+
+        return index
+
+    def _get_index(self, region):
+        entry = self._indexes.get(region)
+
+        if entry is None or (self.ttl is not None and entry[0] <= time.time()):
+            with self._lock:
+                entry = self._indexes.get(region)
+
+                if entry is None or (self.ttl is not None and entry[0] <= time.time()):
+                    self.refresh(region)
+                    entry = self._indexes[region]
+
+        return entry[1]
+
+    def refresh(self, region, realms=None):
+        if realms is None:
+            realms = self.connection.get_all_realms(region, raw=True)
+
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self._indexes[region] = (expires, self._build(realms))
+
+    def invalidate(self, region=None):
+        if region is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(region, None)
+
+    def get(self, region, name):
+        index = self._get_index(region)
+
+        return index.get(name) or index.get(_realm_key(name))
+
+
+# field is None when the realm appeared (old is None) or disappeared (new is None)
+RealmChange = collections.namedtuple('RealmChange', ['region', 'slug', 'field', 'old', 'new', 'realm'])
+
+
+class RealmStatusPoller(object):
+    """Polls ``/realm/status`` of ``regions`` every ``interval`` seconds and publishes transitions.
+
+    The state of every realm is kept by slug and only changes of the watched
+    ``fields`` (a realm going offline, a queue appearing...) are published,
+    as :class:`RealmChange` tuples, to the callbacks and asyncio queues
+    subscribed. The first poll of a region records its state without
+    publishing anything. Each poll also refreshes the connection's realm
+    index, and an unchanged status (``304``) is not compared again.
+    """
+
+    FIELDS = ('status', 'queue', 'population')
+
+    def __init__(self, connection, regions, interval=60, fields=FIELDS, callbacks=None):
+        self.connection = connection
+        self.regions = list(regions)
+        self.interval = interval
+        self.fields = tuple(fields)
+        self.callbacks = list(callbacks or [])
+
+        self._realms = {}
+        self._responses = {}
+        self._queues = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self.callbacks.remove(callback)
+
+    def queue(self, maxsize=0):
+        """An :class:`asyncio.Queue` of the changes, for the running event loop (call it from a coroutine)."""
+        queue = asyncio.Queue(maxsize)
+        with self._lock:
+            self._queues.append((asyncio.get_running_loop(), queue))
+
+        return queue
+
+    def get(self, region, slug):
+        """Latest raw state of a realm, or ``None``."""
+        return self._realms.get(region, {}).get(slug)
+
+    def poll(self, region=None):
+        """Poll one region (or all of them) now and return the changes published."""
+        changes = []
+        for region in [region] if region else self.regions:
+            changes.extend(self._poll(region))
+
+        return changes
+
+    def _poll(self, region):
+        realms = self.connection.get_all_realms(region, raw=True, cache=0)
+        if realms is self._responses.get(region):
+            return []
+
+        self._responses[region] = realms
+        self.connection.realms.refresh(region, realms)
+
+        state = dict((realm['slug'], realm) for realm in realms)
+        previous = self._realms.get(region)
+        self._realms[region] = state
+
+        if previous is None:
+            return []
+
+        changes = []
+        for slug, realm in state.items():
+            old = previous.get(slug)
+
+            if old is None:
+                changes.append(RealmChange(region, slug, None, None, realm, realm))
+                continue
+
+            for field in self.fields:
+                if old.get(field) != realm.get(field):
+                    changes.append(RealmChange(region, slug, field, old.get(field), realm.get(field), realm))
+
+        for slug, old in previous.items():
+            if slug not in state:
+                changes.append(RealmChange(region, slug, None, old, None, old))
+
+        for change in changes:
+            self._publish(change)
+
+        return changes
+
+    def _publish(self, change):
+        for callback in list(self.callbacks):
+            try:
+                callback(change)
+            except Exception:
+                logger.exception('Realm status callback %r failed', callback)
+
+        with self._lock:
+            queues = list(self._queues)
+
+        for loop, queue in queues:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, change)
+            except RuntimeError:
+                # The event loop was closed
+                with self._lock:
+                    self._queues.remove((loop, queue))
+
+    def _run(self):
+        while not self._stopped.is_set():
+            for region in self.regions:
+                try:
+                    self._poll(region)
+                except Exception:
+                    logger.exception('Realm status poll of %s failed', region)
+
+            self._stopped.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='battlenet-realm-status')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,103 @@
+import logging
+import collections
+from .things import Character, Guild
+from .utils import make_connection
+
+__all__ = ['RosterTracker', 'RosterChange', 'JOIN', 'LEAVE', 'RANK', 'LEVEL', 'ACHIEVEMENT_POINTS']
+
+logger = logging.getLogger('battlenet')
+
+JOIN = 'join'
+LEAVE = 'leave'
+RANK = 'rank'
+LEVEL = 'level'
+ACHIEVEMENT_POINTS = 'achievement_points'
+
+# kind, character, old value, new value (None for the side of a join or leave)
+RosterChange = collections.namedtuple('RosterChange', ['kind', 'character', 'old', 'new'])
+
+
+class RosterTracker(object):
+    """Follows a guild roster from poll to poll and reports what changed.
+
+    Only the raw members are compared: unchanged members cost a dictionary
+    lookup and a tuple comparison, and a :class:`Character` is only built
+    for members having a change (or never with ``raw``, the raw character
+    payload being reported instead). The first poll records the roster
+    without reporting anything.
+
+    Polls revalidate the previous response (``cache=0``), so an unchanged
+    roster is answered by a ``304`` and not even decoded again.
+    ``callbacks`` are called with every change.
+    """
+
+    def __init__(self, region, realm, name, connection=None, raw=False, callbacks=None):
+        self.region = region
+        self.realm = realm
+        self.name = name
+        self.connection = connection or make_connection()
+        self.raw = raw
+        self.callbacks = list(callbacks or [])
+
+        self._members = None
+        self._snapshot = None
+
+    def __len__(self):
+        return len(self._snapshot or ())
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def poll(self):
+        data = self.connection.get_guild(self.region, self.realm, self.name, fields=[Guild.MEMBERS],
+                                         raw=True, cache=0)
+
+        return self.update(data[Guild.MEMBERS])
+
+    def update(self, members):
+        """Compare the raw ``members`` list with the previous one and return the changes."""
+        if members is self._members:
+            return []
+
+        snapshot = {}
+        for member in members:
+            character = member['character']
+            snapshot[(character['realm'], character['name'])] = (
+                member['rank'], character.get('level'), character.get('achievementPoints'), character)
+
+        previous, self._snapshot, self._members = self._snapshot, snapshot, members
+
+        if previous is None:
+            return []
+
+        changes = []
+        for key, state in snapshot.items():
+            old = previous.get(key)
+
+            if old is None:
+                changes.append(RosterChange(JOIN, self._character(state[3]), None, state[0]))
+            elif old[:3] != state[:3]:
+                character = self._character(state[3])
+
+                for kind, index in ((RANK, 0), (LEVEL, 1), (ACHIEVEMENT_POINTS, 2)):
+                    if old[index] != state[index]:
+                        changes.append(RosterChange(kind, character, old[index], state[index]))
+
+        for key, old in previous.items():
+            if key not in snapshot:
+                changes.append(RosterChange(LEAVE, self._character(old[3]), old[0], None))
+
+        for change in changes:
+            for callback in list(self.callbacks):
+                try:
+                    callback(change)
+                except Exception:
+                    logger.exception('Roster callback %r failed', callback)
+
+        return changes
+
+    def _character(self, data):
+        if self.raw:
+            return data
+
+        return Character(self.region, data=data, connection=self.connection)
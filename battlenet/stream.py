@@ -0,0 +1,127 @@
+import codecs
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+__all__ = ['iter_array']
+
+WHITESPACE = ' \t\n\r'
+
+
+class _Reader(object):
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder()
+
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def read(self, size=None):
+        """Append at least one chunk (or until ``size`` characters are buffered)."""
+        if self.pos > 65536:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+        while not self.eof:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.buf += self.decoder.decode(b'', final=True)
+                self.eof = True
+                break
+
+            self.buf += self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+            if size is None or len(self.buf) - self.pos >= size:
+                break
+
+        return not self.eof or self.pos < len(self.buf)
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+
+            if self.eof or not self.read():
+                raise ValueError('Unexpected end of JSON document')
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError('Expected %r at position %d' % (char, self.pos))
+        self.pos += 1
+
+    def delimited(self, end):
+        """Whether the scalar ending at ``end`` is followed by ``,``, ``]`` or ``}`` already buffered."""
+        while end < len(self.buf) and self.buf[end] in WHITESPACE:
+            end += 1
+
+        return end < len(self.buf) and self.buf[end] in ',]}'
+
+    def value(self):
+        # Objects, arrays and strings end with their own delimiter, scalars
+        # (numbers, literals) may continue in the next chunk: ``1.`` + ``5``.
+        scalar = self.peek() not in '{["'
+
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self.read(2 * (len(self.buf) - self.pos))
+                continue
+
+            if scalar and not self.eof and not self.delimited(end):
+                self.read(2 * (len(self.buf) - self.pos))
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_array(chunks, key):
+    """Yield the elements of the top level array ``key`` of a JSON object.
+
+    ``chunks`` is an iterable of ``bytes`` (UTF-8) or ``str`` pieces of the
+    document, such as ``response.iter_content()``. Elements are decoded one
+    at a time, so memory use does not grow with the array's length. Other top
+    level values are skipped, and reading stops at the end of the array.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+
+    while True:
+        char = reader.peek()
+        if char == '}':
+            return
+        if char == ',':
+            reader.pos += 1
+            continue
+
+        name = reader.value()
+        reader.expect(':')
+
+        if name != key:
+            reader.value()
+            continue
+
+        if reader.peek() != '[':
+            raise ValueError('%r is not an array' % key)
+        reader.pos += 1
+
+        while True:
+            char = reader.peek()
+            if char == ']':
+                return
+            if char == ',':
+                reader.pos += 1
+                continue
+
+            yield reader.value()
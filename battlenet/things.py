@@ -1,23 +1,131 @@
+import array
+import bisect
 import operator
-import collections
 import datetime
-from .enums import RACE, CLASS, QUALITY, RACE_TO_FACTION, RAIDS, EXPANSION
+import collections.abc
+from .enums import RACE, CLASS, QUALITY, RACE_TO_FACTION, RAID_TO_EXPANSION
 from .utils import make_icon_url, normalize, make_connection
-
-try:
-    import simplejson as json
-except ImportError:
-    import json
+from .columns import to_columns, to_records, progression_matrix
+from .codec import dumps
 
 __all__ = ['Character', 'Guild', 'Realm', 'Raid']
 
 
+class DataField(object):
+    """Attribute read from the raw ``_data`` of a :class:`Thing` on access."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        try:
+            return obj._data[self.key]
+        except KeyError:
+            raise AttributeError(self.key)
+
+
+class cached_property(object):
+    """Attribute built on first access and stored in the slot ``slot``."""
+
+    def __init__(self, func, slot=None):
+        self.func = func
+        self.slot = slot or '_' + func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            value = self.func(obj)
+            setattr(obj, self.slot, value)
+            return value
+
+
+class Gems(dict):
+    __slots__ = ()
+
+    def __missing__(self, key):
+        return None
+
+
+class Achievements(collections.abc.Mapping):
+    """Read-only mapping of achievement ids to completion datetimes.
+
+    Ids and millisecond timestamps are kept in sorted arrays: lookups are
+    binary searches and datetimes are only built for the entries accessed.
+    """
+    __slots__ = ('_ids', '_timestamps', '_by_time')
+
+    def __init__(self, ids, timestamps):
+        if any(a > b for a, b in zip(ids, ids[1:])):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids = [ids[i] for i in order]
+            timestamps = [timestamps[i] for i in order]
+
+        self._ids = array.array('q', ids)
+        self._timestamps = array.array('q', timestamps)
+        self._by_time = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __contains__(self, id_):
+        i = bisect.bisect_left(self._ids, id_)
+        return i < len(self._ids) and self._ids[i] == id_
+
+    def __getitem__(self, id_):
+        return datetime.datetime.fromtimestamp(self.timestamp(id_) / 1000)
+
+    def __repr__(self):
+        return '<%s: %d>' % (self.__class__.__name__, len(self))
+
+    def timestamp(self, id_):
+        """Completion time of ``id_`` in milliseconds since the epoch."""
+        i = bisect.bisect_left(self._ids, id_)
+        if i == len(self._ids) or self._ids[i] != id_:
+            raise KeyError(id_)
+
+        return self._timestamps[i]
+
+    def completed_since(self, when):
+        """Ids of the achievements completed at or after ``when``, oldest first.
+
+        ``when`` is a datetime or a timestamp in milliseconds.
+        """
+        if isinstance(when, datetime.datetime):
+            when = when.timestamp() * 1000
+
+        if self._by_time is None:
+            order = sorted(range(len(self._ids)), key=self._timestamps.__getitem__)
+            self._by_time = (array.array('q', (self._timestamps[i] for i in order)),
+                             array.array('q', (self._ids[i] for i in order)))
+
+        timestamps, ids = self._by_time
+        return ids[bisect.bisect_left(timestamps, when):].tolist()
+
+
 class Thing(object):
+    """Model built from a decoded API payload.
+
+    The payload may be shared with other callers (coalesced requests, cache
+    entries) and is never modified in place: subclasses copy it first.
+    """
+    __slots__ = ('_data',)
+
     def __init__(self, data):
         self._data = data
 
     def to_json(self):
-        return json.dumps(self._data)
+        return dumps(self._data)
 
     def __repr__(self):
         return '<%s>' % (self.__class__.__name__,)
@@ -33,6 +141,8 @@ class Thing(object):
 
 
 class LazyThing(Thing):
+    __slots__ = ('_fields',)
+
     def __init__(self, data, fields=None):
         super(LazyThing, self).__init__(data)
 
@@ -45,13 +155,20 @@ class LazyThing(Thing):
 
             return True
 
-    def _delete_property_fields(self):
-        for field in self._fields:
+    def _delete_property_fields(self, fields=None):
+        for field in (self._fields if fields is None else fields):
             try:
                 delattr(self, '_' + field)
             except AttributeError:
                 pass
 
+    def _merge_data(self, data, fields):
+        merged = dict(self._data)
+        merged.update(data)
+
+        self._populate_data(merged)
+        self._delete_property_fields(fields)
+
     def _populate_data(self, data):
         raise NotImplementedError
 
@@ -60,6 +177,11 @@ class LazyThing(Thing):
 
 
 class Character(LazyThing):
+    __slots__ = ('region', 'connection', 'name', 'level', 'class_', 'race', 'thumbnail', 'gender',
+                 'achievement_points', 'faction', 'last_modified', 'hunter_pets', '_realm', '_professions',
+                 '_progression', '_items', '_mounts', '_companions', '_reputation', '_titles', '_guild',
+                 '_appearance', '_talents', '_stats', '_achievements', '_statistics')
+
     MALE = 0
     FEMALE = 1
 
@@ -157,6 +279,9 @@ class Character(LazyThing):
             and self.get_realm_name() == other.get_realm_name()
 
     def _populate_data(self, data):
+        if Character.GUILD in self._fields and Character.GUILD not in data:
+            data = dict(data, guild=None)
+
         self._data = data
 
         self.name = normalize(data['name'])
@@ -168,9 +293,6 @@ class Character(LazyThing):
         self.achievement_points = data['achievementPoints']
         self.faction = RACE_TO_FACTION[self.race]
 
-        if Character.GUILD in self._fields and Character.GUILD not in self._data:
-            self._data[Character.GUILD] = None
-
         if 'lastModified' in data:
             self.last_modified = datetime.datetime.fromtimestamp(data['lastModified'] / 1000)
         else:
@@ -253,7 +375,7 @@ class Character(LazyThing):
             data = self._data[Character.GUILD]
 
             if data:
-                data['side'] = self.faction.lower()
+                data = dict(data, side=self.faction.lower())
 
                 self._guild = Guild(self.region, realm=self._data['realm'], data=data, connection=self.connection)
             else:
@@ -285,13 +407,8 @@ class Character(LazyThing):
     @property
     def achievements(self):
         if self._refresh_if_not_present(Character.ACHIEVEMENTS):
-            self._achievements = {}
-
-            achievements_completed = self._data['achievements']['achievementsCompleted']
-            achievements_completed_ts = self._data['achievements']['achievementsCompletedTimestamp']
-
-            for id_, timestamp in zip(achievements_completed, achievements_completed_ts):
-                self._achievements[id_] = datetime.datetime.fromtimestamp(timestamp / 1000)
+            self._achievements = Achievements(self._data['achievements']['achievementsCompleted'],
+                                              self._data['achievements']['achievementsCompletedTimestamp'])
 
         return self._achievements
 
@@ -303,8 +420,11 @@ class Character(LazyThing):
         return self._statistics
 
     def refresh(self, *fields):
-        for field in fields:
-            self._fields.add(field)
+        if fields:
+            self._fields.update(fields)
+            self._merge_data(self.connection.get_character(self.region, self._data['realm'],
+                self.name, raw=True, fields=fields), fields)
+            return
 
         self._populate_data(self.connection.get_character(self.region, self._data['realm'],
             self.name, raw=True, fields=self._fields))
@@ -348,6 +468,8 @@ class Character(LazyThing):
 
 
 class Title(Thing):
+    __slots__ = ('_character', 'id', 'format', 'selected')
+
     def __init__(self, character, data):
         super(Title, self).__init__(data)
 
@@ -364,6 +486,8 @@ class Title(Thing):
 
 
 class Reputation(Thing):
+    __slots__ = ('id', 'name', 'standing', 'value', 'max')
+
     def __init__(self, data):
         super(Reputation, self).__init__(data)
 
@@ -385,61 +509,63 @@ class Reputation(Thing):
 
 
 class Stats(Thing):
+    __slots__ = ('_character',)
+
+    agility = DataField('agi')
+    armor = DataField('armor')
+    avoidance_rating = DataField('avoidanceRating')
+    avoidance_ratingBonus = DataField('avoidanceRatingBonus')
+    block = DataField('block')
+    block_rating = DataField('blockRating')
+    crit = DataField('crit')
+    crit_rating = DataField('critRating')
+    dodge = DataField('dodge')
+    dodge_rating = DataField('dodgeRating')
+    haste = DataField('haste')
+    haste_rating = DataField('hasteRating')
+    haste_rating_percent = DataField('hasteRatingPercent')
+    health = DataField('health')
+    intellect = DataField('int')
+    leech = DataField('leech')
+    leech_rating = DataField('leechRating')
+    leech_rating_bonus = DataField('leechRatingBonus')
+    main_hand_damage_max = DataField('mainHandDmgMax')
+    main_hand_damage_min = DataField('mainHandDmgMin')
+    main_hand_dps = DataField('mainHandDps')
+    main_hand_speed = DataField('mainHandSpeed')
+    mana_regen = DataField('mana5')
+    mana_regen_combat = DataField('mana5Combat')
+    mastery = DataField('mastery')
+    mastery_rating = DataField('masteryRating')
+    off_hand_damage_max = DataField('offHandDmgMax')
+    off_hand_damage_min = DataField('offHandDmgMin')
+    off_hand_dps = DataField('offHandDps')
+    off_hand_speed = DataField('offHandSpeed')
+    parry = DataField('parry')
+    parry_rating = DataField('parryRating')
+    power = DataField('power')
+    power_type = DataField('powerType')
+    ranged_damage_max = DataField('rangedDmgMax')
+    ranged_damage_min = DataField('rangedDmgMin')
+    ranged_dps = DataField('rangedDps')
+    ranged_speed = DataField('rangedSpeed')
+    speed_rating = DataField('speedRating')
+    speed_rating_bonus = DataField('speedRatingBonus')
+    spell_crit = DataField('spellCrit')
+    spell_crit_rating = DataField('spellCritRating')
+    spell_penetration = DataField('spellPen')
+    stamina = DataField('sta')
+    strength = DataField('str')
+    versatility = DataField('versatility')
+    versatility_damage_done_bonus = DataField('versatilityDamageDoneBonus')
+    versatility_damage_taken_bonus = DataField('versatilityDamageTakenBonus')
+    versatility_healing_done_bonus = DataField('versatilityHealingDoneBonus')
+
     def __init__(self, character, data):
         super(Stats, self).__init__(data)
 
         self._character = character
 
-        self.agility = data['agi']
-        self.armor = data['armor']
-        self.avoidance_rating = data['avoidanceRating']
-        self.avoidance_ratingBonus = data['avoidanceRatingBonus']
-        self.block = data['block']
-        self.block_rating = data['blockRating']
-        self.crit = data['crit']
-        self.crit_rating = data['critRating']
-        self.dodge = data['dodge']
-        self.dodge_rating = data['dodgeRating']
-        self.haste = data['haste']
-        self.haste_rating = data['hasteRating']
-        self.haste_rating_percent = data['hasteRatingPercent']
-        self.health = data['health']
-        self.intellect = data['int']
-        self.leech = data['leech']
-        self.leech_rating = data['leechRating']
-        self.leech_rating_bonus = data['leechRatingBonus']
-        self.main_hand_damage_max = data['mainHandDmgMax']
-        self.main_hand_damage_min = data['mainHandDmgMin']
-        self.main_hand_dps = data['mainHandDps']
-        self.main_hand_speed = data['mainHandSpeed']
-        self.mana_regen = data['mana5']
-        self.mana_regen_combat = data['mana5Combat']
-        self.mastery = data['mastery']
-        self.mastery_rating = data['masteryRating']
-        self.off_hand_damage_max = data['offHandDmgMax']
-        self.off_hand_damage_min = data['offHandDmgMin']
-        self.off_hand_dps = data['offHandDps']
-        self.off_hand_speed = data['offHandSpeed']
-        self.parry = data['parry']
-        self.parry_rating = data['parryRating']
-        self.power = data['power']
-        self.power_type = data['powerType']
-        self.ranged_damage_max = data['rangedDmgMax']
-        self.ranged_damage_min = data['rangedDmgMin']
-        self.ranged_dps = data['rangedDps']
-        self.ranged_speed = data['rangedSpeed']
-        self.speed_rating = data['speedRating']
-        self.speed_rating_bonus = data['speedRatingBonus']
-        self.spell_crit = data['spellCrit']
-        self.spell_crit_rating = data['spellCritRating']
-        self.spell_penetration = data['spellPen']
-        self.stamina = data['sta']
-        self.strength = data['str']
-        self.versatility = data ['versatility']
-        self.versatility_damage_done_bonus = data ['versatilityDamageDoneBonus']
-        self.versatility_damage_taken_bonus = data ['versatilityDamageTakenBonus']
-        self.versatility_healing_done_bonus = data ['versatilityHealingDoneBonus']
-
     def _convert_rating_to_percent(self, ratios, rating):
         percent = None
 
@@ -454,6 +580,8 @@ class Stats(Thing):
 
 
 class Appearance(Thing):
+    __slots__ = ('face', 'feature', 'hair', 'hair_color', 'show_cloak', 'show_helm', 'skin_color')
+
     def __init__(self, data):
         super(Appearance, self).__init__(data)
 
@@ -466,37 +594,49 @@ class Appearance(Thing):
         self.skin_color = data['skinColor']
 
 
+def _equipped_item(slot):
+    def build(self):
+        data = self._data.get(slot)
+        return EquippedItem(self._character.region, data) if data else None
+
+    return build
+
+
 class Equipment(Thing):
+    __slots__ = ('_character', '_main_hand', '_off_hand', '_ranged', '_head', '_neck', '_shoulder', '_back',
+                 '_chest', '_shirt', '_tabard', '_wrist', '_hands', '_waist', '_legs', '_feet', '_finger1',
+                 '_finger2', '_trinket1', '_trinket2')
+
+    average_item_level = DataField('averageItemLevel')
+    average_item_level_equipped = DataField('averageItemLevelEquipped')
+
+    main_hand = cached_property(_equipped_item('mainHand'), '_main_hand')
+    off_hand = cached_property(_equipped_item('offHand'), '_off_hand')
+    ranged = cached_property(_equipped_item('ranged'), '_ranged')
+
+    head = cached_property(_equipped_item('head'), '_head')
+    neck = cached_property(_equipped_item('neck'), '_neck')
+    shoulder = cached_property(_equipped_item('shoulder'), '_shoulder')
+    back = cached_property(_equipped_item('back'), '_back')
+    chest = cached_property(_equipped_item('chest'), '_chest')
+    shirt = cached_property(_equipped_item('shirt'), '_shirt')
+    tabard = cached_property(_equipped_item('tabard'), '_tabard')
+    wrist = cached_property(_equipped_item('wrist'), '_wrist')
+
+    hands = cached_property(_equipped_item('hands'), '_hands')
+    waist = cached_property(_equipped_item('waist'), '_waist')
+    legs = cached_property(_equipped_item('legs'), '_legs')
+    feet = cached_property(_equipped_item('feet'), '_feet')
+    finger1 = cached_property(_equipped_item('finger1'), '_finger1')
+    finger2 = cached_property(_equipped_item('finger2'), '_finger2')
+    trinket1 = cached_property(_equipped_item('trinket1'), '_trinket1')
+    trinket2 = cached_property(_equipped_item('trinket2'), '_trinket2')
+
     def __init__(self, character, data):
         super(Equipment, self).__init__(data)
 
         self._character = character
 
-        self.average_item_level = data['averageItemLevel']
-        self.average_item_level_equipped = data['averageItemLevelEquipped']
-
-        self.main_hand = EquippedItem(self._character.region, data['mainHand']) if data.get('mainHand') else None
-        self.off_hand = EquippedItem(self._character.region, data['offHand']) if data.get('offHand') else None
-        self.ranged = EquippedItem(self._character.region, data['ranged']) if data.get('ranged') else None
-
-        self.head = EquippedItem(self._character.region, data['head']) if data.get('head') else None
-        self.neck = EquippedItem(self._character.region, data['neck']) if data.get('neck') else None
-        self.shoulder = EquippedItem(self._character.region, data['shoulder']) if data.get('shoulder') else None
-        self.back = EquippedItem(self._character.region, data['back']) if data.get('back') else None
-        self.chest = EquippedItem(self._character.region, data['chest']) if data.get('chest') else None
-        self.shirt = EquippedItem(self._character.region, data['shirt']) if data.get('shirt') else None
-        self.tabard = EquippedItem(self._character.region, data['tabard']) if data.get('tabard') else None
-        self.wrist = EquippedItem(self._character.region, data['wrist']) if data.get('wrist') else None
-
-        self.hands = EquippedItem(self._character.region, data['hands']) if data.get('hands') else None
-        self.waist = EquippedItem(self._character.region, data['waist']) if data.get('waist') else None
-        self.legs = EquippedItem(self._character.region, data['legs']) if data.get('legs') else None
-        self.feet = EquippedItem(self._character.region, data['feet']) if data.get('feet') else None
-        self.finger1 = EquippedItem(self._character.region, data['finger1']) if data.get('finger1') else None
-        self.finger2 = EquippedItem(self._character.region, data['finger2']) if data.get('finger2') else None
-        self.trinket1 = EquippedItem(self._character.region, data['trinket1']) if data.get('trinket1') else None
-        self.trinket2 = EquippedItem(self._character.region, data['trinket2']) if data.get('trinket2') else None
-
     def __getitem__(self, item):
         try:
             return getattr(self, item)
@@ -505,6 +645,8 @@ class Equipment(Thing):
 
 
 class Build(Thing):
+    __slots__ = ('_character', 'icon', 'name', 'role', 'talents', 'selected', 'glyphs', 'trees')
+
     def __init__(self, character, data):
         super(Build, self).__init__(data)
 
@@ -541,6 +683,8 @@ class Build(Thing):
 
 
 class Glyph(Thing):
+    __slots__ = ('_character', 'name', 'glyph', 'item', 'icon')
+
     def __init__(self, character, data):
         super(Glyph, self).__init__(data)
 
@@ -562,6 +706,8 @@ class Glyph(Thing):
 
 
 class Instance(Thing):
+    __slots__ = ('_character', '_type', 'name', 'normal', 'heroic', 'id', 'bosses')
+
     def __init__(self, character, data, type_):
         super(Instance, self).__init__(data)
 
@@ -591,6 +737,8 @@ class Instance(Thing):
 
 
 class Boss(Thing):
+    __slots__ = ('_instance', 'id', 'name', 'lfr', 'flex', 'normal', 'heroic', 'mythic')
+
     def __init__(self, instance, data):
         super(Boss, self).__init__(data)
 
@@ -614,6 +762,8 @@ class Boss(Thing):
 
 
 class Profession(Thing):
+    __slots__ = ('_character', 'id', 'name', 'max', 'rank', 'icon', 'recipes')
+
     def __init__(self, character, data):
         super(Profession, self).__init__(data)
 
@@ -634,6 +784,8 @@ class Profession(Thing):
 
 
 class HunterPet(Thing):
+    __slots__ = ('name', 'creature', 'slot')
+
     def __init__(self, data):
         super(HunterPet, self).__init__(data)
 
@@ -649,6 +801,9 @@ class HunterPet(Thing):
 
 
 class Guild(LazyThing):
+    __slots__ = ('region', 'connection', 'name', 'emblem', 'achievement_points', 'faction', '_achievements', '_members',
+                 '_realm')
+
     ACHIEVEMENTS = 'achievements'
     MEMBERS = 'members'
     ALL_FIELDS = [ACHIEVEMENTS, MEMBERS]
@@ -661,7 +816,7 @@ class Guild(LazyThing):
 
         if realm and name:
             data = self.connection.get_guild(region, realm, name, raw=True, fields=self._fields)
-            data['realm'] = realm  # Copy over realm since API does not provide it!
+            data = dict(data, realm=realm)  # Copy over realm since API does not provide it!
 
         self._populate_data(data)
 
@@ -679,7 +834,7 @@ class Guild(LazyThing):
 
     def _populate_data(self, data):
         if self._data is not None:
-            data['realm'] = self._data['realm']  # Copy over realm since API does not provide it!
+            data = dict(data, realm=self._data['realm'])  # Copy over realm since API does not provide it!
 
         self._data = data
 
@@ -692,8 +847,11 @@ class Guild(LazyThing):
         }[data['side']] if isinstance(data['side'], int) else data['side']).capitalize()
 
     def refresh(self, *fields):
-        for field in fields:
-            self._fields.add(field)
+        if fields:
+            self._fields.update(fields)
+            self._merge_data(self.connection.get_guild(self.region, self._data['realm'],
+                self.name, raw=True, fields=fields), fields)
+            return
 
         self._populate_data(self.connection.get_guild(self.region, self._data['realm'],
             self.name, raw=True, fields=self._fields))
@@ -703,13 +861,8 @@ class Guild(LazyThing):
     @property
     def achievements(self):
         if self._refresh_if_not_present(Guild.ACHIEVEMENTS):
-            self._achievements = {}
-
-            achievements_completed = self._data['achievements']['achievementsCompleted']
-            achievements_completed_ts = self._data['achievements']['achievementsCompletedTimestamp']
-
-            for id_, timestamp in zip(achievements_completed, achievements_completed_ts):
-                self._achievements[id_] = datetime.datetime.fromtimestamp(timestamp / 1000)
+            self._achievements = Achievements(self._data['achievements']['achievementsCompleted'],
+                                              self._data['achievements']['achievementsCompletedTimestamp'])
 
 #            criteria = self._data['achievements']['criteria']
 #            criteria_quantity = self._data['achievements']['criteriaQuantity']
@@ -737,6 +890,21 @@ class Guild(LazyThing):
 
         return self._members
 
+    def iter_members(self):
+        """Iterate over the members without keeping the roster in memory.
+
+        Already loaded members are reused, otherwise the roster is streamed
+        from the API as it is downloaded.
+        """
+        if Guild.MEMBERS in self._data:
+            for member in self.members:
+                yield member
+            return
+
+        for member in self.connection.iter_guild_members(self.region, self._data['realm'], self.name):
+            member['character']._guild = self
+            yield member
+
     @property
     def realm(self):
         if not hasattr(self, '_realm'):
@@ -744,6 +912,22 @@ class Guild(LazyThing):
 
         return self._realm
 
+    def to_columns(self, columns=None, records=False):
+        """Roster as NumPy arrays built from the raw members, see :func:`battlenet.columns.to_columns`."""
+        self._refresh_if_not_present(Guild.MEMBERS)
+
+        rows = [(member['character'], member) for member in self._data[Guild.MEMBERS]]
+
+        return to_records(rows, columns) if records else to_columns(rows, columns)
+
+    def progression_matrix(self, expansions=None):
+        """Raid kills of the roster, see :func:`battlenet.columns.progression_matrix`.
+
+        Members are expected to have their progression loaded, e.g. with
+        ``connection.prefetch(guild, members=[Character.PROGRESSION])``.
+        """
+        return progression_matrix([member['character'] for member in self.members], expansions)
+
     def get_leader(self):
         for member in self.members:
             if member['rank'] is 0:
@@ -754,6 +938,8 @@ class Guild(LazyThing):
 
 
 class Emblem(Thing):
+    __slots__ = ('border', 'border_color', 'icon', 'icon_color', 'background_color')
+
     def __init__(self, data):
         super(Emblem, self).__init__(data)
 
@@ -765,6 +951,9 @@ class Emblem(Thing):
 
 
 class Perk(Thing):
+    __slots__ = ('_region', 'id', 'name', 'description', 'subtext', 'cooldown', 'cast_time', 'icon', 'range',
+                 'guild_level')
+
     def __init__(self, region, data):
         super(Perk, self).__init__(data)
 
@@ -797,6 +986,8 @@ class Perk(Thing):
 
 
 class Reward(Thing):
+    __slots__ = ('min_guild_level', 'min_guild_reputation', 'races', 'achievement', 'item')
+
     def __init__(self, region, data):
         super(Reward, self).__init__(data)
 
@@ -817,6 +1008,8 @@ class Reward(Thing):
 
 
 class Realm(Thing):
+    __slots__ = ('region', 'connection', 'name', 'slug', 'status', 'queue', 'population', 'type')
+
     NORMAL = 'normal'
     RP = 'roleplaying'
 
@@ -852,7 +1045,8 @@ class Realm(Thing):
         self.type = data['type']
 
     def refresh(self):
-        self._populate_data(self.connection.get_realm(self.name, raw=True))
+        self.connection.realms.invalidate(self.region)
+        self._populate_data(self.connection.get_realm(self.region, self.name, raw=True))
 
     def has_queue(self):
         return self.queue
@@ -865,34 +1059,47 @@ class Realm(Thing):
 
 
 class EquippedItem(Thing):
+    __slots__ = ('_region', '_gems', '_azeriteEmpoweredItem')
+
+    id = DataField('id')
+    name = DataField('name')
+    quality = DataField('quality')
+    itemLevel = DataField('itemLevel')
+    icon = DataField('icon')
+
+    artifactId = DataField('artifactId')
+    artifactAppearanceId = DataField('artifactAppearanceId')
+    artifactTraits = DataField('artifactTraits')
+    relics = DataField('relics')
+
     def __init__(self, region, data):
         super(EquippedItem, self).__init__(data)
 
         self._region = region
 
-        self.id = data['id']
-        self.name = data['name']
-        self.quality = data['quality']
-        self.itemLevel = data['itemLevel']
-        self.icon = data['icon']
-
-        self.enchant = data['tooltipParams'].get('enchant')
+    @property
+    def enchant(self):
+        return self._data['tooltipParams'].get('enchant')
 
-        self.gems = collections.defaultdict(lambda: None)
-        for key, value in data['tooltipParams'].items():
+    @cached_property
+    def gems(self):
+        gems = Gems()
+        for key, value in self._data['tooltipParams'].items():
             if key.startswith('gem'):
-                self.gems[int(key[3:])] = value
+                gems[int(key[3:])] = value
 
-        self.artifactId = data['artifactId']
-        self.artifactAppearanceId = data['artifactAppearanceId']
-        self.artifactTraits = data['artifactTraits']
-        self.relics = data['relics']
+        return gems
 
-        self.azeriteLevel = ('azeriteItem' in data and data['azeriteItem']['azeriteLevel']) or 0
-        self.azeriteEmpoweredItem = []
-        if 'azeriteEmpoweredItem' in data:
-            for azerite_info in data['azeriteEmpoweredItem']['azeritePowers']:
-                self.azeriteEmpoweredItem.append(azerite_info)
+    @property
+    def azeriteLevel(self):
+        return ('azeriteItem' in self._data and self._data['azeriteItem']['azeriteLevel']) or 0
+
+    @cached_property
+    def azeriteEmpoweredItem(self):
+        if 'azeriteEmpoweredItem' in self._data:
+            return list(self._data['azeriteEmpoweredItem']['azeritePowers'])
+
+        return []
 
     def __str__(self):
         return self.name
@@ -908,6 +1115,8 @@ class EquippedItem(Thing):
 
 
 class Class(Thing):
+    __slots__ = ('id', 'mask', 'name', 'power_type')
+
     def __init__(self, data):
         super(Class, self).__init__(data)
 
@@ -923,6 +1132,8 @@ class Class(Thing):
         return '<%s: %s>' % (self.__class__.__name__, self.name)
 
 class Race(Thing):
+    __slots__ = ('id', 'mask', 'name', 'side')
+
     def __init__(self, data):
         super(Race, self).__init__(data)
 
@@ -938,13 +1149,10 @@ class Race(Thing):
         return '<%s: %s>' % (self.__class__.__name__, self.name)
 
 class Raid(Thing):
+    __slots__ = ('id',)
+
     def __init__(self, id):
         self.id = id
 
     def expansion(self):
-        for exp, ids in RAIDS.items():
-            if self.id in ids:
-                for e in EXPANSION.keys():
-                    if EXPANSION[e][0] == exp:
-                        return exp, EXPANSION[e][1]
-        return (None, None)
+        return RAID_TO_EXPANSION.get(self.id, (None, None))
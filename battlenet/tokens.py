@@ -0,0 +1,213 @@
+import os
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+import requests
+from oauthlib.oauth2 import BackendApplicationClient
+from requests_oauthlib import OAuth2Session
+from .codec import loads, dumps
+
+__all__ = ['TokenManager', 'BearerAuth']
+
+BNET_TOKEN_URL = 'https://{region:s}.battle.net/oauth/token'
+
+MIN_REFRESH_DELAY = 1
+REFRESH_RETRY_DELAY = 30
+
+logger = logging.getLogger('battlenet')
+
+
+class TokenManager(object):
+    """Thread-safe store of OAuth2 client credentials tokens, one per region.
+
+    A manager can be shared by several :class:`Connection` instances. Tokens
+    are refreshed in a background thread ``refresh_margin`` seconds before
+    they expire (halfway through their lifetime when shorter), retrying every
+    ``retry_delay`` seconds on failure, and optionally persisted to the JSON
+    file at ``path`` so a new process can reuse a still valid token.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, client_id, client_secret, scope=None, refresh_margin=300, path=None, background=True,
+                 retry_delay=REFRESH_RETRY_DELAY):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = list(scope or ['wow.profile'])
+        self.refresh_margin = refresh_margin
+        self.path = path
+        self.background = background
+        self.retry_delay = retry_delay
+
+        self._tokens = {}
+        self._timers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if path:
+            self._load()
+
+    @classmethod
+    def shared(cls, client_id, client_secret):
+        """Process wide manager for the given credentials."""
+        with cls._shared_lock:
+            key = (client_id, client_secret)
+            if key not in cls._shared:
+                cls._shared[key] = cls(client_id, client_secret)
+
+            return cls._shared[key]
+
+    def _region_lock(self, region):
+        with self._lock:
+            if region not in self._locks:
+                self._locks[region] = threading.Lock()
+
+            return self._locks[region]
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                tokens = loads(f.read())
+        except (IOError, OSError, ValueError):
+            return
+
+        for region, token in tokens.items():
+            if token.get('client_id') == self.client_id and not self._expired(token, 0):
+                self._tokens[region] = token
+                self._schedule(region, token)
+
+    def _save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            tokens = dict(self._tokens)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tokens')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(dumps(tokens))
+            os.replace(tmp, self.path)
+        except (IOError, OSError):
+            logger.warning('Could not persist tokens to %s', self.path, exc_info=True)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _expired(self, token, margin):
+        return token.get('expires_at', 0) - margin <= time.time()
+
+    def _schedule(self, region, token):
+        if not self.background:
+            return
+
+        lifetime = token.get('expires_at', 0) - time.time()
+        delay = lifetime - self.refresh_margin
+        if delay <= 0:
+            # Tokens living less than the margin are refreshed halfway, not in a loop
+            delay = max(lifetime * 0.5, MIN_REFRESH_DELAY)
+
+        self._start_timer(region, delay)
+
+    def _start_timer(self, region, delay):
+        timer = threading.Timer(delay, self._refresh_in_background, [region])
+        timer.daemon = True
+
+        with self._lock:
+            if self._closed:
+                return
+
+            previous = self._timers.pop(region, None)
+            self._timers[region] = timer
+
+        if previous is not None:
+            previous.cancel()
+
+        timer.start()
+
+    def _refresh_in_background(self, region):
+        try:
+            self.refresh(region)
+        except Exception:
+            # Any error (network, oauthlib, disk) must not stop the refresh loop
+            logger.warning('Background token refresh failed for %s, retrying in %ss', region, self.retry_delay,
+                           exc_info=True)
+            self._start_timer(region, self.retry_delay)
+
+    def fetch_token(self, region):
+        session = OAuth2Session(client=BackendApplicationClient(client_id=self.client_id, scope=self.scope))
+
+        token = dict(session.fetch_token(
+            token_url=BNET_TOKEN_URL.format(region=region),
+            client_id=self.client_id,
+            client_secret=self.client_secret))
+
+        if 'expires_at' not in token:
+            token['expires_at'] = time.time() + float(token.get('expires_in', 0))
+        token['client_id'] = self.client_id
+
+        return token
+
+    def set_token(self, region, token):
+        token = dict(token)
+        if 'expires_at' not in token:
+            token['expires_at'] = time.time() + float(token.get('expires_in', 0))
+
+        with self._lock:
+            self._tokens[region] = token
+
+        self._schedule(region, token)
+        self._save()
+
+    def refresh(self, region):
+        with self._region_lock(region):
+            token = self.fetch_token(region)
+            self.set_token(region, token)
+
+        return token
+
+    def get_token(self, region):
+        token = self._tokens.get(region)
+
+        if token is None or self._expired(token, 0):
+            with self._region_lock(region):
+                token = self._tokens.get(region)
+
+                if token is None or self._expired(token, 0):
+                    token = self.fetch_token(region)
+                    self.set_token(region, token)
+
+        return token['access_token']
+
+    async def get_token_async(self, region):
+        token = self._tokens.get(region)
+
+        if token is not None and not self._expired(token, 0):
+            return token['access_token']
+
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_token, region)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+
+        for timer in timers:
+            timer.cancel()
+
+
+class BearerAuth(requests.auth.AuthBase):
+    def __init__(self, token_manager, region):
+        self.token_manager = token_manager
+        self.region = region
+
+    def __call__(self, r):
+        r.headers['Authorization'] = 'Bearer %s' % self.token_manager.get_token(self.region)
+        return r
@@ -0,0 +1,172 @@
+import os
+import hashlib
+import logging
+import tempfile
+import requests
+from requests.structures import CaseInsensitiveDict
+from .pool import PooledAdapter
+from .tokens import BearerAuth
+from .codec import loads, dumps
+
+__all__ = ['HTTPTransport', 'RecordingTransport', 'ReplayTransport', 'FixtureNotFound']
+
+logger = logging.getLogger('battlenet')
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+def _normalize(params):
+    """Query parameters with sequences (e.g. a ``set`` of fields) as sorted lists."""
+    normalized = {}
+    for k, v in (params or {}).items():
+        if isinstance(v, (list, tuple, set, frozenset)):
+            v = sorted(map(str, v))
+        normalized[k] = v
+
+    return normalized
+
+
+def fixture_name(url, params=None):
+    """File name of the fixture recorded for a request."""
+    items = []
+    for k, v in sorted(_normalize(params).items()):
+        if isinstance(v, list):
+            v = ','.join(v)
+        items.append('%s=%s' % (k, v))
+
+    key = '%s?%s' % (url, '&'.join(items))
+
+    return '%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def save_fixture(directory, url, params, status_code, headers, content, reason=''):
+    fixture = {
+        'url': url,
+        'params': _normalize(params),
+        'status_code': status_code,
+        'reason': reason,
+        'headers': dict(headers or {}),
+        'body': content.decode('utf-8'),
+    }
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.fixture')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(dumps(fixture))
+        os.replace(tmp, os.path.join(directory, fixture_name(url, params)))
+    except (IOError, OSError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_fixture(directory, url, params=None):
+    path = os.path.join(directory, fixture_name(url, params))
+
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except (IOError, OSError):
+        raise FixtureNotFound('No recorded response for %s %r in %s' % (url, params, directory))
+
+
+class HTTPTransport(object):
+    """Sends requests to the API, one pooled authenticated session per region (the default)."""
+
+    def open(self, connection, region):
+        session = requests.Session()
+        session.auth = BearerAuth(connection.token_manager, region)
+
+        adapter = PooledAdapter(pool_maxsize=connection.pool_size, pool_block=connection.pool_block,
+                                max_retries=connection.connect_retries, stats=connection.pool_stats)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+
+class RecordingTransport(object):
+    """Sends requests with ``transport`` and saves every response under ``directory``.
+
+    Throttled (429) responses are not recorded.
+    """
+
+    def __init__(self, directory, transport=None):
+        self.directory = directory
+        self.transport = transport or HTTPTransport()
+
+    def open(self, connection, region):
+        return RecordingSession(self.transport.open(connection, region), self.directory)
+
+
+class RecordingSession(object):
+    def __init__(self, session, directory):
+        self.session = session
+        self.directory = directory
+
+    @property
+    def auth(self):
+        return getattr(self.session, 'auth', None)
+
+    def get(self, url, params=None, **kwargs):
+        r = self.session.get(url, params=params, **kwargs)
+
+        if r.status_code != 429:
+            save_fixture(self.directory, url, params, r.status_code, r.headers, r.content,
+                         getattr(r, 'reason', ''))
+            logger.debug('Recorded %s', url)
+
+        return r
+
+
+class ReplayTransport(object):
+    """Answers requests with the responses recorded under ``directory``, without network access.
+
+    Requests which were never recorded raise :class:`FixtureNotFound`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def open(self, connection, region):
+        return ReplaySession(self.directory)
+
+
+class ReplaySession(object):
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get(self, url, params=None, **kwargs):
+        return ReplayResponse(load_fixture(self.directory, url, params))
+
+
+class ReplayResponse(object):
+    def __init__(self, fixture):
+        self.url = fixture['url']
+        self.status_code = fixture['status_code']
+        self.reason = fixture.get('reason', '')
+        self.headers = CaseInsensitiveDict(fixture['headers'])
+        self.content = fixture['body'].encode('utf-8')
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError('%d %s Error: %s for url: %s' % (
+                self.status_code, kind, self.reason, self.url), response=self)
+
+    def json(self):
+        return loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
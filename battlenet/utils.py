@@ -24,9 +24,17 @@ def make_icon_url(region, icon, size='large'):
     return 'http://%s.media.blizzard.com/wow/icons/%d/%s.jpg' % (region, size, icon)
 
 
-def make_connection():
+def make_connection(**kwargs):
     if not hasattr(make_connection, 'Connection'):
         from .connection import Connection
         make_connection.Connection = Connection
 
-    return make_connection.Connection(client_id=client_id(), client_secret=client_secret())
+    if os.environ.get('BNET_REPLAY_DIR'):
+        from .transport import ReplayTransport
+        kwargs.setdefault('transport', ReplayTransport(os.environ['BNET_REPLAY_DIR']))
+        kwargs.setdefault('rate_limiter', False)
+    elif os.environ.get('BNET_RECORD_DIR'):
+        from .transport import RecordingTransport
+        kwargs.setdefault('transport', RecordingTransport(os.environ['BNET_RECORD_DIR']))
+
+    return make_connection.Connection(client_id=client_id(), client_secret=client_secret(), **kwargs)
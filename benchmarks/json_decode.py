@@ -0,0 +1,58 @@
+"""Decoding speed of the installed JSON backends on character payloads.
+
+Decodes the same response bodies with every backend available to
+:mod:`battlenet.codec`. Bodies are synthetic characters with achievements,
+statistics and items loaded, or recorded responses given with ``--file``.
+
+    python -m benchmarks.json_decode --count 200
+    python -m benchmarks.json_decode --file character.json --file guild.json
+"""
+
+import time
+import argparse
+from battlenet import codec
+from benchmarks.payloads import make_character
+
+
+def bench(backend, bodies, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in bodies:
+            backend.loads(body)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--file', action='append', default=[], help='recorded response body')
+    args = parser.parse_args()
+
+    if args.file:
+        bodies = []
+        for path in args.file:
+            with open(path, 'rb') as f:
+                bodies.append(f.read())
+    else:
+        bodies = [codec.dumps(make_character(i, fields=('achievements', 'stats', 'items'))).encode('utf-8')
+                  for i in range(args.count)]
+
+    size = sum(len(body) for body in bodies)
+    print('bodies:  %d (%.1f MiB)' % (len(bodies), size / 1048576.0))
+
+    results = []
+    for name in codec.available_backends():
+        results.append((name, bench(codec._load(name), bodies, args.repeat)))
+
+    baseline = dict(results)['json']
+    for name, elapsed in results:
+        print('%-12s %8.2f ms/body  %8.1f MiB/s  x%.2f' % (
+            name, 1000 * elapsed / len(bodies), size / 1048576.0 / elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Memory used by model objects for a large roster.
+
+Builds ``--count`` characters with equipment and stats loaded (and every
+equipped item built, unless ``--lazy``) and reports the memory held by the
+model objects (raw payloads excluded), compared with the same attributes
+stored in per-instance ``__dict__``s as the models did before they were
+slotted.
+
+    python -m benchmarks.memory --count 5000
+"""
+
+import gc
+import argparse
+import tracemalloc
+from battlenet import Character, Connection, Thing
+from battlenet.things import Equipment
+from benchmarks.payloads import make_character
+
+
+class Plain(object):
+    pass
+
+
+SLOTS = [name for name, value in vars(Equipment).items() if hasattr(value, 'slot')]
+
+
+def slot_values(obj):
+    values = {}
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if hasattr(obj, name):
+                values[name] = getattr(obj, name)
+    return values
+
+
+def as_plain(obj, seen):
+    """Copy a slotted model graph into equivalent ``__dict__`` based objects."""
+    if isinstance(obj, list):
+        return [as_plain(item, seen) for item in obj]
+    if not isinstance(obj, Thing):
+        return obj
+    if id(obj) in seen:
+        return seen[id(obj)]
+
+    plain = seen[id(obj)] = Plain()
+    for name, value in slot_values(obj).items():
+        plain.__dict__[name] = as_plain(value, seen) if name != '_data' else value
+    return plain
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--lazy', action='store_true', help='do not build the equipped items')
+    args = parser.parse_args()
+
+    connection = Connection()
+    payloads = [make_character(i, fields=('items', 'stats')) for i in range(args.count)]
+
+    def build():
+        characters = []
+        for payload in payloads:
+            character = Character('eu', data=payload, connection=connection)
+            equipment = character.equipment
+            character.stats
+            if not args.lazy:
+                for slot in SLOTS:
+                    item = equipment[slot]
+                    if item is not None:
+                        item.gems
+                        item.azeriteEmpoweredItem
+            characters.append(character)
+        return characters
+
+    characters, slotted = measure(build)
+    _, plain = measure(lambda: [as_plain(character, {}) for character in characters])
+
+    print('characters:           %d' % args.count)
+    print('slotted models:       %8.1f KiB  (%6.0f B/character)' % (slotted / 1024.0, float(slotted) / args.count))
+    print('__dict__ equivalent:  %8.1f KiB  (%6.0f B/character)' % (plain / 1024.0, float(plain) / args.count))
+    print('saving:               %8.1f%%' % (100.0 * (plain - slotted) / plain))
+
+
+if __name__ == '__main__':
+    main()
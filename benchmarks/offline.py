@@ -0,0 +1,160 @@
+"""Offline benchmark suite replaying recorded responses.
+
+Times request dispatch, JSON decoding, model construction and cache hits
+without network access. Synthetic responses are written as fixtures to a
+temporary directory and served by :class:`ReplayTransport`, the same way
+responses recorded with ``BNET_RECORD_DIR`` are.
+
+    python -m benchmarks.offline
+    python -m benchmarks.offline --only dispatch --only cache
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+from battlenet import Character, Connection, Guild, MemoryCache, SQLiteCache, EUROPE, codec
+from battlenet.connection import URL_FORMAT
+from battlenet.transport import ReplayTransport, save_fixture
+from benchmarks.payloads import make_character, make_guild
+
+CHARACTERS = 50
+FIELDS = [Character.ITEMS, Character.STATS]
+
+
+def url(path):
+    return URL_FORMAT.format(region=EUROPE, game='wow', path=path)
+
+
+def synthesize(directory):
+    """Write fixtures for the requests made by the benchmarks."""
+    locale = Connection.defaults['locale']
+
+    for i in range(CHARACTERS):
+        payload = make_character(i, fields=FIELDS)
+        save_fixture(directory, url('/character/tarren-mill/%s' % payload['name'].lower()),
+                     {'fields': FIELDS, 'locale': locale}, 200, {}, codec.dumps(payload).encode('utf-8'))
+
+    save_fixture(directory, url('/guild/tarren-mill/excellence'), {'fields': [Guild.MEMBERS], 'locale': locale},
+                 200, {}, codec.dumps(make_guild(members=1000)).encode('utf-8'))
+
+
+def names():
+    return [make_character(i)['name'].lower() for i in range(CHARACTERS)]
+
+
+def connection(directory, **kwargs):
+    return Connection(transport=ReplayTransport(directory), rate_limiter=False, **kwargs)
+
+
+def bench_dispatch(directory):
+    conn = connection(directory)
+    characters = names()
+
+    def run():
+        for name in characters:
+            conn.make_request(EUROPE, '/character/tarren-mill/%s' % name, {'fields': FIELDS})
+
+    return run, len(characters)
+
+
+def bench_decode(directory):
+    conn = connection(directory)
+    session = conn._get_client(EUROPE)
+    bodies = [session.get(url('/character/tarren-mill/%s' % name),
+                          params={'fields': FIELDS, 'locale': conn.locale}).content for name in names()]
+
+    def run():
+        for body in bodies:
+            codec.loads(body)
+
+    return run, len(bodies)
+
+
+def bench_character(directory):
+    conn = connection(directory)
+    payloads = [conn.make_request(EUROPE, '/character/tarren-mill/%s' % name, {'fields': FIELDS})
+                for name in names()]
+
+    def run():
+        for payload in payloads:
+            character = Character(EUROPE, data=payload, connection=conn)
+            character.stats.crit
+            equipment = character.equipment
+            for slot in ('head', 'chest', 'main_hand', 'trinket1'):
+                equipment[slot]
+
+    return run, len(payloads)
+
+
+def bench_members(directory):
+    conn = connection(directory)
+    payload = conn.make_request(EUROPE, '/guild/tarren-mill/excellence', {'fields': [Guild.MEMBERS]})
+    payload['realm'] = 'Tarren Mill'
+
+    def run():
+        Guild(EUROPE, data=dict(payload), connection=conn).members
+
+    return run, 1
+
+
+def bench_cache(directory, cache):
+    conn = connection(directory, cache=cache)
+    characters = names()
+    for name in characters:
+        conn.make_request(EUROPE, '/character/tarren-mill/%s' % name, {'fields': FIELDS}, cache=True)
+
+    def run():
+        for name in characters:
+            conn.make_request(EUROPE, '/character/tarren-mill/%s' % name, {'fields': FIELDS}, cache=True)
+
+    return run, len(characters)
+
+
+def bench_memory_cache(directory):
+    return bench_cache(directory, MemoryCache())
+
+
+def bench_sqlite_cache(directory):
+    return bench_cache(directory, SQLiteCache(':memory:'))
+
+
+BENCHMARKS = [
+    ('dispatch', 'make_request, replayed, uncached', bench_dispatch),
+    ('decode', '%s.loads of character bodies' % codec.get_backend(), bench_decode),
+    ('character', 'Character + stats + equipment', bench_character),
+    ('members', 'Guild.members of 1000 members', bench_members),
+    ('cache', 'make_request, MemoryCache hit', bench_memory_cache),
+    ('sqlite', 'make_request, SQLiteCache hit', bench_sqlite_cache),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', action='append', choices=[name for name, _, _ in BENCHMARKS])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        synthesize(directory)
+
+        for name, description, setup in BENCHMARKS:
+            if args.only and name not in args.only:
+                continue
+
+            run, operations = setup(directory)
+            best = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+
+            print('%-10s %10.1f us/op   %s' % (name, 1e6 * best / operations, description))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Synthetic API payloads shaped like real Battle.net responses."""
+
+import random
+
+SLOTS = ('head', 'neck', 'shoulder', 'back', 'chest', 'shirt', 'tabard', 'wrist', 'hands', 'waist',
+         'legs', 'feet', 'finger1', 'finger2', 'trinket1', 'trinket2', 'mainHand', 'offHand')
+
+STATS = {
+    'agi': 'int', 'armor': 'int', 'avoidanceRating': 'int', 'avoidanceRatingBonus': 'float',
+    'block': 'float', 'blockRating': 'int', 'crit': 'float', 'critRating': 'int', 'dodge': 'float',
+    'dodgeRating': 'int', 'haste': 'float', 'hasteRating': 'int', 'hasteRatingPercent': 'float',
+    'health': 'int', 'int': 'int', 'leech': 'float', 'leechRating': 'int', 'leechRatingBonus': 'float',
+    'mainHandDmgMax': 'float', 'mainHandDmgMin': 'float', 'mainHandDps': 'float', 'mainHandSpeed': 'float',
+    'mana5': 'float', 'mana5Combat': 'float', 'mastery': 'float', 'masteryRating': 'int',
+    'offHandDmgMax': 'float', 'offHandDmgMin': 'float', 'offHandDps': 'float', 'offHandSpeed': 'float',
+    'parry': 'float', 'parryRating': 'int', 'power': 'int', 'powerType': 'str', 'rangedDmgMax': 'float',
+    'rangedDmgMin': 'float', 'rangedDps': 'float', 'rangedSpeed': 'float', 'speedRating': 'int',
+    'speedRatingBonus': 'float', 'spellCrit': 'float', 'spellCritRating': 'int', 'spellPen': 'int',
+    'sta': 'int', 'str': 'int', 'versatility': 'int', 'versatilityDamageDoneBonus': 'float',
+    'versatilityDamageTakenBonus': 'float', 'versatilityHealingDoneBonus': 'float',
+}
+
+RAIDS = (('Uldir', 9389, 8), ("Battle of Dazar'alor", 8670, 9), ('Crucible of Storms', 10057, 2),
+         ("The Eternal Palace", 10425, 8), ("Ny'alotha, the Waking City", 10522, 12))
+
+
+def make_item(rng, slot):
+    return {
+        'id': rng.randint(100000, 170000),
+        'name': 'Item %s' % slot,
+        'icon': 'inv_%s_%d' % (slot.lower(), rng.randint(1, 99)),
+        'quality': 4,
+        'itemLevel': rng.randint(400, 485),
+        'tooltipParams': {'gem0': rng.randint(1, 99999), 'enchant': rng.randint(1, 9999)},
+        'stats': [{'stat': rng.randint(1, 80), 'amount': rng.randint(10, 900)} for _ in range(4)],
+        'armor': rng.randint(0, 600),
+        'context': 'raid-mythic',
+        'bonusLists': [rng.randint(1000, 6000) for _ in range(3)],
+        'artifactId': 0,
+        'displayInfoId': rng.randint(1, 200000),
+        'artifactAppearanceId': 0,
+        'artifactTraits': [],
+        'relics': [],
+        'appearance': {},
+        'azeriteItem': {'azeriteLevel': 0, 'azeriteExperience': 0},
+        'azeriteEmpoweredItem': {'azeritePowers': [{'id': rng.randint(1, 600), 'tier': t}
+                                                   for t in range(4)]},
+    }
+
+
+def make_progression(rng):
+    raids = []
+    for name, id_, bosses in RAIDS:
+        raids.append({
+            'name': name,
+            'id': id_,
+            'lfr': 2, 'normal': 2, 'heroic': 1, 'mythic': 0,
+            'bosses': [{
+                'id': id_ * 100 + i,
+                'name': '%s boss %d' % (name, i),
+                'lfrKills': rng.randint(0, 20),
+                'normalKills': rng.randint(0, 20),
+                'heroicKills': rng.randint(0, 20),
+                'mythicKills': rng.randint(0, 5),
+            } for i in range(bosses)],
+        })
+
+    return {'raids': raids}
+
+
+def make_achievements(rng, count):
+    ids = sorted(rng.sample(range(1, 15000), count))
+    return {
+        'achievementsCompleted': ids,
+        'achievementsCompletedTimestamp': [1224090780000 + rng.randint(0, 10 ** 12) for _ in ids],
+        'criteria': ids,
+        'criteriaQuantity': [rng.randint(0, 1000) for _ in ids],
+        'criteriaTimestamp': [1224090780000 + rng.randint(0, 10 ** 12) for _ in ids],
+        'criteriaCreated': [1224090780000 + rng.randint(0, 10 ** 12) for _ in ids],
+    }
+
+
+def make_character(index=0, fields=(), seed=None, realm='Tarren Mill'):
+    rng = random.Random(index if seed is None else seed)
+
+    data = {
+        'lastModified': 1571000000000 + index,
+        'name': 'Character%d' % index,
+        'realm': realm,
+        'battlegroup': 'Misery',
+        'class': rng.randint(1, 12),
+        'race': rng.choice((1, 2, 3, 4, 5, 6, 7, 8, 10, 11, 22)),
+        'gender': rng.randint(0, 1),
+        'level': 120,
+        'achievementPoints': rng.randint(0, 40000),
+        'thumbnail': 'tarren-mill/1/%d-avatar.jpg' % index,
+        'calcClass': 'U',
+        'faction': 1,
+        'totalHonorableKills': rng.randint(0, 100000),
+    }
+
+    if 'items' in fields:
+        items = {'averageItemLevel': 470, 'averageItemLevelEquipped': 468}
+        for slot in SLOTS:
+            items[slot] = make_item(rng, slot)
+        data['items'] = items
+
+    if 'stats' in fields:
+        data['stats'] = dict((key, {'int': rng.randint(0, 90000), 'float': rng.random() * 100,
+                                    'str': 'mana'}[kind]) for key, kind in STATS.items())
+
+    if 'progression' in fields:
+        data['progression'] = make_progression(rng)
+
+    if 'achievements' in fields:
+        data['achievements'] = make_achievements(rng, 3000)
+
+    return data
+
+
+def make_guild(members=500, seed=0, realm='Tarren Mill'):
+    rng = random.Random(seed)
+
+    return {
+        'lastModified': 1571000000000,
+        'name': 'Guild%d' % seed,
+        'realm': realm,
+        'battlegroup': 'Misery',
+        'level': 25,
+        'side': 1,
+        'achievementPoints': 3000,
+        'emblem': {'icon': 1, 'iconColor': 'ff000000', 'iconColorId': 1, 'border': 1,
+                   'borderColor': 'ff000000', 'borderColorId': 1, 'backgroundColor': 'ff000000',
+                   'backgroundColorId': 1},
+        'members': [{'character': make_character(i, realm=realm), 'rank': rng.randint(0, 9)}
+                    for i in range(members)],
+    }
+
+
+def make_realms(count=250):
+    populations = ('low', 'medium', 'high', 'full')
+    return {
+        'realms': [{
+            'type': 'normal',
+            'population': populations[i % len(populations)],
+            'queue': i % 17 == 0,
+            'status': i % 29 != 0,
+            'name': 'Realm %d' % i,
+            'slug': 'realm-%d' % i,
+            'battlegroup': 'Misery',
+            'locale': 'en_GB',
+            'timezone': 'Europe/Paris',
+            'connected_realms': ['realm-%d' % i],
+        } for i in range(count)]
+    }
@@ -6,12 +6,13 @@ import os
 
 # the battlenet modules
 import battlenet
+from battlenet import Character
 from battlenet import Guild
 from battlenet import Raid
 
 # load your key if existing
-PUBLIC_KEY = os.environ.get('BNET_PUBLIC_KEY')
-PRIVATE_KEY = os.environ.get('BNET_PRIVATE_KEY')
+CLIENT_ID = os.environ.get('BNET_CLIENT_ID')
+CLIENT_SECRET = os.environ.get('BNET_CLIENT_SECRET')
 
 # the existing region
 regions = {
@@ -29,24 +30,25 @@ if __name__ == '__main__':
     guild_name = sys.argv[3]
 
     # open set connection
-    battlenet.Connection.setup(public_key=PUBLIC_KEY, private_key=PRIVATE_KEY, locale='fr')
+    battlenet.Connection.setup(client_id=CLIENT_ID, client_secret=CLIENT_SECRET, locale='fr')
+    connection = battlenet.Connection()
 
     # load the guild
-    guild = Guild(region, realm_name, guild_name)
+    guild = Guild(region, realm_name, guild_name, fields=[Guild.MEMBERS], connection=connection)
+
+    # fetch the progression of all the max level members in parallel
+    members = [(member['character'].get_realm_name(), member['character'].name)
+               for member in guild.members if member['character'].level == 120]
 
     # display the kills of all the guild members
-    nb_level_85 = 0
-    for character in guild.members:
-        if character['character'].level != 85:
+    for (realm, name), character in connection.get_characters(region, members, fields=[Character.PROGRESSION]):
+        print(name)
+        if isinstance(character, battlenet.CharacterNotFound):
+            print('\tNOT FOUND')
             continue
-        nb_level_85 += 1
-        print character['character'].name
-        try:
-            for r in character['character'].progression['raids']:
-                print '\t%s (%s)' % (r.name, Raid(r.id).expansion()[0])
-                for b in r.bosses:
-                    print '\t\tN: %2d H: %2d %s' % (b.normal, b.heroic, b.name)
-        except battlenet.CharacterNotFound:
-            print '\tNOT FOUND'
-
-    print nb_level_85, 'characters level 85'
+        for r in character.progression['raids']:
+            print('\t%s (%s)' % (r.name, Raid(r.id).expansion()[0]))
+            for b in r.bosses:
+                print('\t\tN: %2d H: %2d %s' % (b.normal, b.heroic, b.name))
+
+    print(len(members), 'characters level 120')
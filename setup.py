@@ -18,7 +18,7 @@ CLASSIFIERS = [
 
 setup(name='battlenet',
     version=VERSION,
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'tests']),
     author='Stanislav Vishnevskiy',
     author_email='vishnevskiy@gmail.com',
     url='https://github.com/vishnevskiy/battlenet',
@@ -1,7 +1,28 @@
+from tests.test_achievements import *
+from tests.test_aio import *
+from tests.test_bulk import *
+from tests.test_cache import *
 from tests.test_character import *
+from tests.test_coalesce import *
+from tests.test_codec import *
+from tests.test_columns import *
 from tests.test_data import *
+from tests.test_enums import *
 from tests.test_exceptions import *
 from tests.test_guild import *
+from tests.test_metadata import *
+from tests.test_metrics import *
+from tests.test_pool import *
+from tests.test_prefetch import *
 from tests.test_raid import *
+from tests.test_ratelimit import *
 from tests.test_realm import *
+from tests.test_realm_index import *
+from tests.test_realm_poller import *
+from tests.test_refresh import *
 from tests.test_regions import *
+from tests.test_roster import *
+from tests.test_slots import *
+from tests.test_stream import *
+from tests.test_tokens import *
+from tests.test_transport import *
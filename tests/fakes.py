@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import threading
+import collections
+import requests
+from urllib.parse import urlsplit, unquote
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+Request = collections.namedtuple('Request', ['path', 'params', 'headers', 'stream'])
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def make_character(name='Scobomb', realm='Tarren Mill', **values):
+    data = {
+        'name': name,
+        'realm': realm,
+        'level': 120,
+        'class': 11,
+        'race': 6,
+        'gender': 1,
+        'thumbnail': '',
+        'achievementPoints': 100,
+    }
+    data.update(values)
+
+    return data
+
+
+def make_guild(name='Excellence', realm='Tarren Mill', members=None):
+    data = {
+        'name': name,
+        'realm': realm,
+        'level': 25,
+        'side': 1,
+        'achievementPoints': 1000,
+    }
+
+    if members is not None:
+        data['members'] = [{'character': make_character('Member%d' % i, realm, achievementPoints=10 * i),
+                            'rank': i % 10} for i in range(members)]
+
+    return data
+
+
+def make_realms(count):
+    return [{'name': 'Realm %d' % i, 'slug': 'realm-%d' % i, 'status': True, 'queue': False,
+             'population': 'high', 'type': 'normal'} for i in range(count)]
+
+
+class FakeResponse(object):
+    def __init__(self, data=None, status_code=200, headers=None):
+        self.url = None
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = json.dumps(data).encode('utf-8') if data is not None else b''
+        self.chunk_size = None
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError('%d Client Error: %s for url: %s' % (
+                self.status_code, self.reason, self.url), response=self)
+
+    def iter_content(self, chunk_size=1):
+        chunk_size = self.chunk_size or chunk_size
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport(object):
+    """Transport answering requests in memory, for ``Connection(transport=...)``.
+
+    Responses are built by :meth:`respond` from the API path (e.g.
+    ``/character/tarren-mill/scobomb``), the query parameters and the
+    headers; by default ``data`` is returned. Requests are recorded in
+    ``requests``, each one sleeping ``delay`` seconds or waiting on
+    ``barrier`` when given, and ``max_active`` is the peak number of requests
+    in flight. Streamed bodies are read in ``chunk_size`` pieces when set.
+    """
+
+    def __init__(self, data=None, delay=0, chunk_size=None, barrier=None):
+        self.data = data
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.barrier = barrier
+
+        self.requests = []
+        self.response = None
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def open(self, connection, region):
+        return self
+
+    def respond(self, path, params, headers):
+        return FakeResponse(self.data)
+
+    def get(self, url, params=None, headers=None, stream=False, **kwargs):
+        request = Request('/' + urlsplit(url).path.split('/', 2)[2], dict(params or {}), dict(headers or {}), stream)
+
+        with self.lock:
+            self.requests.append(request)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if self.barrier is not None:
+                self.barrier.wait()
+
+            response = self.respond(request.path, request.params, request.headers)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+        response.url = url
+        response.chunk_size = self.chunk_size
+        self.response = response
+
+        return response
+
+
+class CharacterTransport(FakeTransport):
+    """Characters named after the path, ``missing`` ones are not found (404)."""
+
+    def respond(self, path, params, headers):
+        realm, name = map(unquote, path.split('/')[-2:])
+        if name == 'missing':
+            return FakeResponse({}, 404)
+
+        return FakeResponse(make_character(name.capitalize(), realm))
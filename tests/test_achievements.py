@@ -0,0 +1,67 @@
+import datetime
+import battlenet
+from battlenet import Character
+from battlenet.things import Achievements
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+IDS = [513, 6, 1020, 7, 8]
+TIMESTAMPS = [1224083580000, 1300000000000, 1100000000000, 1400000000000, 1300000000000]
+
+
+class AchievementsTest(unittest.TestCase):
+    def setUp(self):
+        self.achievements = Achievements(IDS, TIMESTAMPS)
+
+    def test_mapping(self):
+        expected = dict((id_, datetime.datetime.fromtimestamp(ts / 1000)) for id_, ts in zip(IDS, TIMESTAMPS))
+
+        self.assertEqual(len(self.achievements), 5)
+        self.assertEqual(sorted(self.achievements), sorted(IDS))
+        self.assertEqual(dict(self.achievements.items()), expected)
+        self.assertEqual(self.achievements, expected)
+        self.assertEqual(self.achievements.get(513), expected[513])
+
+    def test_membership(self):
+        for id_ in IDS:
+            self.assertIn(id_, self.achievements)
+
+        for id_ in (0, 9, 514, 5000):
+            self.assertNotIn(id_, self.achievements)
+            self.assertIsNone(self.achievements.get(id_))
+
+        with self.assertRaises(KeyError):
+            self.achievements[9]
+
+    def test_timestamp(self):
+        self.assertEqual(self.achievements.timestamp(1020), 1100000000000)
+
+    def test_completed_since(self):
+        self.assertEqual(self.achievements.completed_since(0), [1020, 513, 6, 8, 7])
+        self.assertEqual(self.achievements.completed_since(1300000000000), [6, 8, 7])
+        self.assertEqual(self.achievements.completed_since(datetime.datetime.fromtimestamp(1400000000)), [7])
+        self.assertEqual(self.achievements.completed_since(2000000000000), [])
+
+    def test_empty(self):
+        achievements = Achievements([], [])
+
+        self.assertEqual(len(achievements), 0)
+        self.assertNotIn(1, achievements)
+        self.assertEqual(achievements.completed_since(0), [])
+
+    def test_character(self):
+        character = Character(battlenet.EUROPE, data={
+            'name': 'Clí', 'realm': 'Tarren Mill', 'level': 120, 'class': 11, 'race': 6, 'gender': 1,
+            'thumbnail': '', 'achievementPoints': 10,
+            'achievements': {'achievementsCompleted': IDS, 'achievementsCompletedTimestamp': TIMESTAMPS},
+        }, connection=battlenet.Connection())
+
+        self.assertIsInstance(character.achievements, Achievements)
+        self.assertIn(513, character.achievements)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import battlenet
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.threads = set()
+        self.refreshed = []
+        self.barrier = None
+
+    def get_character(self, region, realm, name, fields=None, raw=False, cache=False):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        if self.barrier is not None:
+            self.barrier.wait()
+        if name == 'missing':
+            raise battlenet.CharacterNotFound
+        return (region, realm, name)
+
+
+class FakeCharacter(object):
+    def __init__(self, connection):
+        self.connection = connection
+        self.fields = None
+
+    def refresh(self, *fields):
+        time.sleep(0.05)
+        self.fields = fields
+
+
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeConnection()
+        self.connection = battlenet.AsyncConnection(connection=self.fake, concurrency=4)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_mirrors_getters(self):
+        async def run():
+            return await self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb')
+
+        self.assertEqual(asyncio.run(run()), (battlenet.EUROPE, 'Tarren Mill', 'Scobomb'))
+
+    def test_concurrent_fan_out(self):
+        async def run():
+            return await asyncio.gather(*[
+                self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', str(i)) for i in range(8)])
+
+        # Calls only complete by groups of 4, so 4 of them must run at once
+        self.fake.barrier = threading.Barrier(4, timeout=10)
+        results = asyncio.run(run())
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len(self.fake.threads), 4)
+
+    def test_get_characters(self):
+        async def run():
+            names = [('tarren-mill', str(i)) for i in range(10)] + [('tarren-mill', 'missing')]
+            return [item async for item in self.connection.get_characters(battlenet.EUROPE, names)]
+
+        results = dict(asyncio.run(run()))
+
+        self.assertEqual(len(results), 11)
+        self.assertEqual(results[('tarren-mill', '3')], (battlenet.EUROPE, 'tarren-mill', '3'))
+        self.assertIsInstance(results[('tarren-mill', 'missing')], battlenet.CharacterNotFound)
+
+    def test_refresh(self):
+        characters = [FakeCharacter(self.fake) for _ in range(4)]
+
+        asyncio.run(self.connection.refresh(characters, 'progression'))
+
+        for character in characters:
+            self.assertEqual(character.fields, ('progression',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import threading
+import battlenet
+from battlenet import Character
+from tests.fakes import CharacterTransport
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class BulkCharacterTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = CharacterTransport(delay=0.05)
+        self.connection = battlenet.Connection(transport=self.transport)
+
+    def test_get_characters(self):
+        names = [('tarren-mill', 'char%d' % i) for i in range(11)] + [('tarren-mill', 'missing')]
+
+        # Requests only complete by groups of 4, so 4 workers must run at once
+        self.transport.barrier = threading.Barrier(4, timeout=10)
+        results = dict(self.connection.get_characters(battlenet.EUROPE, names,
+            fields=[Character.PROGRESSION], workers=4))
+
+        self.assertEqual(self.transport.max_active, 4)
+        self.assertEqual(len(results), 12)
+        self.assertIsInstance(results[('tarren-mill', 'missing')], battlenet.CharacterNotFound)
+        self.assertIsInstance(results[('tarren-mill', 'char1')], Character)
+        self.assertEqual(results[('tarren-mill', 'char1')].name, 'Char1')
+
+    def test_stop_early(self):
+        names = [('tarren-mill', 'char%d' % i) for i in range(100)]
+
+        results = self.connection.get_characters(battlenet.EUROPE, names, workers=4)
+        next(results)
+        results.close()
+
+        self.assertLessEqual(len(self.transport.requests), 2 * 4 + 1)
+
+    def test_raw(self):
+        results = list(self.connection.get_characters(battlenet.EUROPE, [('tarren-mill', 'scobomb')], raw=True))
+
+        self.assertEqual(results[0][1]['name'], 'Scobomb')
+
+if __name__ == '__main__':
+    unittest.main()
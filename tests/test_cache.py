@@ -0,0 +1,181 @@
+import os
+import time
+import shutil
+import tempfile
+import battlenet
+from battlenet.cache import MemoryCache, SQLiteCache, make_cache_key
+from tests.fakes import FakeTransport, FakeResponse
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class PerksTransport(FakeTransport):
+    def __init__(self, etag=None):
+        super(PerksTransport, self).__init__()
+        self.etag = etag
+
+    def respond(self, path, params, headers):
+        if self.etag and headers.get('If-None-Match') == self.etag:
+            return FakeResponse(status_code=304)
+
+        return FakeResponse({'perks': []}, headers={'ETag': self.etag} if self.etag else {})
+
+
+class MemoryCacheTest(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = MemoryCache()
+
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', {'a': 1})
+        self.assertEqual(cache.get('a'), {'a': 1})
+
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_entries(self):
+        cache = MemoryCache(max_entries=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_lru_bytes(self):
+        cache = MemoryCache(max_bytes=10)
+
+        cache.set('a', 1, size=6)
+        cache.set('b', 2, size=6)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['bytes'], 6)
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=3600, ttls={'/data/': 0.01, '/data/item/': 60})
+
+        self.assertEqual(cache.get_ttl('/realm/status'), 3600)
+        self.assertEqual(cache.get_ttl('/data/guild/perks'), 0.01)
+        self.assertEqual(cache.get_ttl('/data/item/1'), 60)
+
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+
+    def test_stale(self):
+        cache = MemoryCache()
+
+        cache.set('a', 1, ttl=0.01, etag='"x"')
+        cache.set('b', 2, ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get_stale('a').value, 1)
+        self.assertEqual(cache.get_stale('a').etag, '"x"')
+        self.assertIsNone(cache.get_stale('b'))
+
+    def test_key(self):
+        self.assertEqual(make_cache_key('us', 'wow', '/character/a/b', {'fields': ['stats', 'items'], 'locale': 'en_US'}),
+                         make_cache_key('us', 'wow', '/character/a/b', {'locale': 'en_US', 'fields': ['items', 'stats']}))
+        self.assertNotEqual(make_cache_key('us', 'wow', '/data/item/1', {'locale': 'en_US'}),
+                            make_cache_key('eu', 'wow', '/data/item/1', {'locale': 'en_US'}))
+
+
+class SQLiteCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared(self):
+        SQLiteCache(self.path).set('a', {'perks': [1, 2]})
+
+        cache = SQLiteCache(self.path)
+        self.assertEqual(cache.get('a'), {'perks': [1, 2]})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_ttl(self):
+        cache = SQLiteCache(self.path)
+
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_stale(self):
+        cache = SQLiteCache(self.path)
+
+        cache.set('a', {'a': 1}, ttl=0.01, last_modified='Sun, 18 Oct 2026 10:00:00 GMT')
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stale('a').value, {'a': 1})
+        self.assertEqual(cache.get_stale('a').last_modified, 'Sun, 18 Oct 2026 10:00:00 GMT')
+
+    def test_max_entries(self):
+        cache = SQLiteCache(self.path, max_entries=2)
+
+        cache.set('a', 1)
+        time.sleep(0.01)
+        cache.set('b', 2)
+        time.sleep(0.01)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    def test_connection(self):
+        transport = PerksTransport()
+        battlenet.Connection(cache=SQLiteCache(self.path), transport=transport).get_guild_perks(
+            battlenet.UNITED_STATES)
+        battlenet.Connection(cache=SQLiteCache(self.path), transport=transport).get_guild_perks(
+            battlenet.UNITED_STATES)
+
+        self.assertEqual(len(transport.requests), 1)
+
+
+class ConnectionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = PerksTransport()
+        self.connection = battlenet.Connection(cache=MemoryCache(), transport=self.transport)
+
+    def test_opt_in(self):
+        self.connection.make_request(battlenet.UNITED_STATES, '/guild/a/b')
+        self.connection.make_request(battlenet.UNITED_STATES, '/guild/a/b')
+        self.assertEqual(len(self.transport.requests), 2)
+
+        self.connection.make_request(battlenet.UNITED_STATES, '/guild/a/b', cache=True)
+        self.connection.make_request(battlenet.UNITED_STATES, '/guild/a/b', cache=True)
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_revalidation(self):
+        transport = PerksTransport(etag='"abc"')
+        connection = battlenet.Connection(cache=MemoryCache(), transport=transport)
+
+        first = connection.make_request(battlenet.UNITED_STATES, '/character/a/b', cache=0)
+        second = connection.make_request(battlenet.UNITED_STATES, '/character/a/b', cache=0)
+
+        self.assertEqual([request.headers.get('If-None-Match') for request in transport.requests], [None, '"abc"'])
+        self.assertIs(first, second)
+
+    def test_static_data(self):
+        self.connection.get_guild_perks(battlenet.UNITED_STATES)
+        self.connection.get_guild_perks(battlenet.UNITED_STATES)
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.connection.cache.stats()['hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
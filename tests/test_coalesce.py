@@ -0,0 +1,99 @@
+import time
+import threading
+import battlenet
+from battlenet import Character
+from battlenet.coalesce import SingleFlight
+from tests.fakes import FakeTransport, make_character, make_guild
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+def run_threads(target, count=10):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_shared_result(self):
+        flights = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        results = run_threads(lambda: flights.do('key', work))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertEqual(len(flights), 0)
+
+    def test_shared_error(self):
+        flights = SingleFlight()
+        errors = []
+
+        def work():
+            time.sleep(0.1)
+            raise battlenet.APIError('boom')
+
+        def call():
+            try:
+                flights.do('key', work)
+            except battlenet.APIError as e:
+                errors.append(e)
+
+        run_threads(call, 5)
+
+        self.assertEqual(len(errors), 5)
+
+    def test_sequential(self):
+        flights = SingleFlight()
+
+        self.assertEqual(flights.do('key', lambda: 1), 1)
+        self.assertEqual(flights.do('key', lambda: 2), 2)
+
+
+class ConnectionCoalesceTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport({'realms': []}, delay=0.1)
+
+    def test_make_request(self):
+        connection = battlenet.Connection(transport=self.transport)
+
+        run_threads(lambda: connection.get_all_realms(battlenet.UNITED_STATES, raw=True))
+
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_disabled(self):
+        connection = battlenet.Connection(coalesce=False, transport=self.transport)
+
+        run_threads(lambda: connection.get_all_realms(battlenet.UNITED_STATES, raw=True), 3)
+
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_shared_payload(self):
+        payload = make_character(guild=make_guild())
+        connection = battlenet.Connection(transport=FakeTransport(payload, delay=0.1))
+
+        results = run_threads(lambda: connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb',
+                                                               fields=[Character.GUILD], raw=True), 2)
+        self.assertIs(results[0], results[1])
+
+        Character(battlenet.EUROPE, data=results[0], connection=connection).guild
+        self.assertEqual(results[1], payload)
+
+        data = make_character()
+        Character(battlenet.EUROPE, data=data, fields=[Character.GUILD], connection=connection)
+        self.assertEqual(data, make_character())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from battlenet import codec
+from battlenet.things import Thing
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+DOCUMENT = {
+    'name': u'Clí',
+    'level': 120,
+    'lastModified': 1565000000000,
+    'thumbnail': 'tarren-mill/1/2-avatar.jpg',
+    'stats': {'crit': 21.5, 'health': 315000},
+    'achievements': {'achievementsCompleted': [6, 7, 8]},
+    'guild': None,
+    'hidden': False,
+}
+
+
+class CodecTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = codec.get_backend()
+
+    def tearDown(self):
+        codec.set_backend(self.backend)
+
+    def test_default_is_fastest(self):
+        self.assertEqual(codec.get_backend(), codec.available_backends()[0])
+        self.assertIn('json', codec.available_backends())
+
+    def test_round_trip(self):
+        for name in codec.available_backends():
+            codec.set_backend(name)
+
+            encoded = codec.dumps(DOCUMENT)
+            self.assertIsInstance(encoded, str)
+            self.assertEqual(codec.loads(encoded), DOCUMENT)
+            self.assertEqual(codec.loads(encoded.encode('utf-8')), DOCUMENT)
+
+    def test_invalid(self):
+        for name in codec.available_backends():
+            codec.set_backend(name)
+
+            with self.assertRaises(ValueError):
+                codec.loads(b'{"name": ')
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            codec.set_backend('yaml')
+
+    def test_to_json(self):
+        for name in codec.available_backends():
+            codec.set_backend(name)
+
+            self.assertEqual(codec.loads(Thing(DOCUMENT).to_json()), DOCUMENT)
+
+if __name__ == '__main__':
+    unittest.main()
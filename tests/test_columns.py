@@ -0,0 +1,107 @@
+import copy
+import battlenet
+from battlenet import Guild
+from battlenet.columns import to_columns, required_fields, progression_matrix, DIFFICULTIES
+from tests.fakes import CharacterTransport, load_fixture, make_guild
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class ColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = battlenet.Connection()
+        self.guild = Guild(battlenet.EUROPE, data=make_guild(members=50), connection=self.connection)
+
+    def test_guild(self):
+        columns = self.guild.to_columns(['name', 'level', 'rank', 'achievement_points', 'item_level'])
+
+        self.assertEqual(columns['level'].dtype, numpy.int16)
+        self.assertEqual(len(columns['name']), 50)
+        self.assertEqual(columns['name'][3], 'Member3')
+        self.assertEqual(int(columns['achievement_points'].sum()),
+                         sum(m['character']['achievementPoints'] for m in self.guild._data['members']))
+        self.assertTrue(numpy.isnan(columns['item_level']).all())
+        self.assertFalse(hasattr(self.guild, '_members'))
+
+    def test_records(self):
+        records = self.guild.to_columns(['level', 'class'], records=True)
+
+        self.assertEqual(records.dtype.names, ('level', 'class'))
+        self.assertTrue((records.level == 120).all())
+
+    def test_characters(self):
+        payloads = [load_fixture('character.json') for _ in range(3)]
+        rows = [(payload, None) for payload in payloads]
+
+        columns = to_columns(rows, ['item_level', 'boss_kills'])
+
+        self.assertAlmostEqual(float(columns['item_level'][0]), 470)
+        self.assertGreater(columns['boss_kills'][0], 0)
+
+    def test_required_fields(self):
+        self.assertEqual(required_fields(['name', 'item_level', 'item_level_equipped', 'boss_kills']),
+                         ['items', 'progression'])
+
+    def test_connection(self):
+        connection = battlenet.Connection(transport=CharacterTransport())
+
+        columns = connection.characters_to_columns(battlenet.EUROPE,
+            [('tarren-mill', 'a'), ('tarren-mill', 'missing'), ('tarren-mill', 'b')], ['name', 'level'])
+
+        self.assertEqual(sorted(columns['name']), ['A', 'B'])
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class ProgressionMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.payloads = [load_fixture('character.json') for _ in range(4)]
+
+    def test_shape(self):
+        progression = progression_matrix(self.payloads)
+
+        self.assertEqual(progression.kills.shape, (4, 8 + 9 + 2 + 8 + 12, len(DIFFICULTIES)))
+        self.assertEqual(progression.bosses[0].expansion, 'bfa')
+        self.assertEqual(progression.bosses[0].raid_id, 9389)
+
+        boss = self.payloads[2]['progression']['raids'][1]['bosses'][3]
+        column = [b.boss_id for b in progression.bosses].index(boss['id'])
+        self.assertEqual(progression.kills[2, column, DIFFICULTIES.index('heroic')], boss['heroicKills'])
+        self.assertEqual(progression.kills[2, column, DIFFICULTIES.index('flex')], 0)
+
+    def test_order(self):
+        payload = load_fixture('character.json')
+        payload['progression'] = {'raids': [
+            {'id': 8670, 'name': 'Dazar', 'bosses': [{'id': 1, 'name': 'a', 'normalKills': 1}]},
+            {'id': 6996, 'name': 'Highmaul', 'bosses': [{'id': 2, 'name': 'b', 'normalKills': 2}]},
+        ]}
+
+        progression = progression_matrix([payload])
+
+        self.assertEqual([b.expansion for b in progression.bosses], ['wod', 'bfa'])
+        self.assertEqual(progression.kills[0, :, DIFFICULTIES.index('normal')].tolist(), [2, 1])
+
+        progression = progression_matrix([payload], expansions=['bfa'])
+        self.assertEqual(progression.kills.shape, (1, 1, 5))
+
+    def test_guild(self):
+        guild = Guild(battlenet.EUROPE, data=make_guild(members=3), connection=battlenet.Connection())
+        progression = load_fixture('character.json')['progression']
+        for member in guild._data['members']:
+            member['character']['progression'] = copy.deepcopy(progression)
+
+        progression = guild.progression_matrix()
+        killed = (progression.kills[:, :, DIFFICULTIES.index('mythic')] > 0).any(axis=0)
+
+        self.assertEqual(progression.kills.shape[0], 3)
+        self.assertEqual(len(killed), len(progression.bosses))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,7 @@
 import os
 import battlenet
 from operator import itemgetter
-from battlenet.utils import client_id
-from battlenet.utils import client_secret
+from battlenet.utils import make_connection
 
 try:
     import unittest2 as unittest
@@ -11,7 +10,7 @@ except ImportError:
 
 class DataTest(unittest.TestCase):
     def setUp(self):
-        self.connection = battlenet.Connection(client_id=client_id(), client_secret=client_secret())
+        self.connection = make_connection()
 
     def test_races(self):
         races = self.connection.get_character_races(battlenet.UNITED_STATES)
@@ -0,0 +1,43 @@
+import sys
+import battlenet
+from battlenet import Raid
+from battlenet.enums import RAID_ORDER
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class EnumsTest(unittest.TestCase):
+    def test_raid_expansion(self):
+        for position, (short, name) in battlenet.EXPANSION.items():
+            for raid_id in battlenet.RAIDS[short]:
+                self.assertEqual(Raid(raid_id).expansion(), (short, name))
+                self.assertEqual(RAID_ORDER[raid_id][0], position)
+
+        self.assertEqual(Raid(10522).expansion(), ('bfa', 'Battle for Azeroth'))
+        self.assertEqual(Raid(1).expansion(), (None, None))
+
+    def test_class_by_name(self):
+        self.assertEqual(battlenet.CLASS_BY_NAME['Death Knight'], 6)
+        for id_, name in battlenet.CLASS.items():
+            self.assertEqual(battlenet.CLASS_BY_NAME[name], id_)
+
+    def test_race_by_name(self):
+        self.assertEqual(battlenet.RACE_BY_NAME['Pandaren'], (24, 25, 26))
+        self.assertEqual(battlenet.RACE_BY_NAME['Night Elf'], (4,))
+
+    def test_faction_races(self):
+        self.assertIn(10, battlenet.FACTION_RACES['Horde'])
+        self.assertIn(25, battlenet.FACTION_RACES['Alliance'])
+        self.assertNotIn(25, battlenet.FACTION_RACES['Horde'])
+
+    def test_interned(self):
+        name = ''.join(['Night', ' ', 'Elf'])
+
+        self.assertIs(battlenet.RACE[4], sys.intern(name))
+        self.assertIs(battlenet.EXPANSION_BY_SHORT['bfa'][1], battlenet.EXPANSION[7][1])
+
+if __name__ == '__main__':
+    unittest.main()
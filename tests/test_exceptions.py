@@ -1,7 +1,6 @@
 import os
 import battlenet
-from battlenet.utils import client_id
-from battlenet.utils import client_secret
+from battlenet.utils import make_connection
 
 try:
     import unittest2 as unittest
@@ -10,7 +9,7 @@ except ImportError:
 
 class ExceptionTest(unittest.TestCase):
     def setUp(self):
-        self.connection = battlenet.Connection(client_id=client_id(), client_secret=client_secret())
+        self.connection = make_connection()
 
     def test_character_not_found(self):
         self.assertRaises(battlenet.CharacterNotFound,
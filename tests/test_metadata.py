@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import battlenet
+from battlenet import MetadataStore
+from tests.fakes import FakeTransport, FakeResponse
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class ItemTransport(FakeTransport):
+    """Items below 1000 have a name, others need the ``raid-normal`` context, 404 is missing."""
+
+    def respond(self, path, params, headers):
+        parts = path.split('/')
+        if parts[-1] == '404':
+            return FakeResponse({}, 404)
+
+        if parts[-2] in ('item', 'spell'):
+            id_, context = int(parts[-1]), None
+        else:
+            id_, context = int(parts[-2]), parts[-1]
+
+        if id_ >= 1000 and context is None:
+            return FakeResponse({'id': id_, 'availableContexts': ['raid-normal', 'raid-heroic']})
+
+        return FakeResponse({'id': id_, 'name': 'Thing %d' % id_, 'context': context or ''})
+
+    @property
+    def paths(self):
+        return [request.path for request in self.requests]
+
+
+class MetadataStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = ItemTransport()
+        self.connection = battlenet.Connection(rate_limiter=False, transport=self.transport)
+        self.store = MetadataStore(self.connection)
+
+    def test_repeat_lookups(self):
+        for _ in range(3):
+            self.assertEqual(self.store.get_item(battlenet.EUROPE, 18803)['name'], 'Thing 18803')
+
+        self.assertEqual(len(self.transport.paths), 2)
+
+    def test_context(self):
+        data, context = self.store.lookup(battlenet.EUROPE, '/item/18803')
+
+        self.assertEqual(context, 'raid-normal')
+        self.assertEqual(self.store.get_item(battlenet.EUROPE, 18803, context='raid-normal'), data)
+        self.assertEqual(len(self.transport.paths), 2)
+
+        self.store.get_item(battlenet.EUROPE, 18803, context='raid-heroic')
+        self.assertEqual(self.transport.paths[-1].split('/')[-1], 'raid-heroic')
+
+    def test_spell(self):
+        self.assertEqual(self.store.get_spell(battlenet.EUROPE, 17)['name'], 'Thing 17')
+        self.assertEqual(self.store.get_spell(battlenet.EUROPE, 17)['name'], 'Thing 17')
+        self.assertEqual(len(self.transport.paths), 1)
+
+    def test_preload(self):
+        self.store.get_item(battlenet.EUROPE, 1)
+
+        items = self.store.preload_items(battlenet.EUROPE, [1, 2, 3, 2, 2000, 404], workers=4)
+
+        self.assertEqual(sorted(items), [1, 2, 3, 2000])
+        self.assertEqual(len([path for path in self.transport.paths if path == '/item/2']), 1)
+        self.assertEqual(len(self.transport.paths), 1 + 2 + 2 + 1)
+
+        self.store.preload_items(battlenet.EUROPE, [1, 2, 3, 2000])
+        self.assertEqual(len(self.transport.paths), 6)
+
+    def test_disk(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'items.db')
+            MetadataStore(self.connection, path=path).get_item(battlenet.EUROPE, 18803)
+
+            store = MetadataStore(self.connection, path=path)
+            data, context = store.lookup(battlenet.EUROPE, '/item/18803')
+
+            self.assertEqual(data['name'], 'Thing 18803')
+            self.assertEqual(context, 'raid-normal')
+            self.assertEqual(len(self.transport.paths), 2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_locale(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'items.db')
+            MetadataStore(self.connection, path=path).get_item(battlenet.EUROPE, 17)
+
+            connection = battlenet.Connection(locale='fr_FR', rate_limiter=False, transport=self.transport)
+            MetadataStore(connection, path=path).get_item(battlenet.EUROPE, 17)
+
+            self.assertEqual(len(self.transport.paths), 2)
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
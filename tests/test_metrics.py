@@ -0,0 +1,138 @@
+import battlenet
+from battlenet import Character, Metrics, MemoryCache
+from battlenet.metrics import RollingHistogram, path_template
+from tests.fakes import FakeTransport, CharacterTransport, make_realms
+from tests.test_ratelimit import ThrottledTransport
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class HistogramTest(unittest.TestCase):
+    def test_rolling(self):
+        histogram = RollingHistogram(size=100)
+        for value in range(1000):
+            histogram.add(value)
+
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(len(histogram), 100)
+        self.assertEqual(snapshot['count'], 1000)
+        self.assertEqual(snapshot['max'], 999)
+        self.assertEqual(snapshot['p50'], 950)
+        self.assertEqual(histogram.percentile(0), 900)
+
+    def test_empty(self):
+        self.assertIsNone(RollingHistogram().percentile(50))
+        self.assertEqual(RollingHistogram().snapshot(), {'count': 0})
+
+    def test_path_template(self):
+        self.assertEqual(path_template('/character/tarren-mill/scobomb'), '/character/{realm}/{name}')
+        self.assertEqual(path_template('/guild/tarren-mill/excellence'), '/guild/{realm}/{name}')
+        self.assertEqual(path_template('/item/18803/raid-mythic'), '/item/{id}/{context}')
+        self.assertEqual(path_template('/realm/status'), '/realm/status')
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.metrics = Metrics(hooks=[self.events.append])
+        self.connection = battlenet.Connection(metrics=self.metrics, cache=MemoryCache(), rate_limiter=False,
+                                               transport=CharacterTransport())
+
+    def test_event(self):
+        self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb', fields=[Character.ITEMS])
+
+        event = self.events[0]
+        self.assertEqual(event.region, battlenet.EUROPE)
+        self.assertEqual(event.path, '/character/{realm}/{name}')
+        self.assertEqual(event.status, 200)
+        self.assertGreater(event.bytes, 0)
+        self.assertIsNone(event.cache)
+        self.assertFalse(event.coalesced)
+        self.assertIsNone(event.error)
+        self.assertEqual(set(event.timings), set(['http', 'decode', 'model']))
+        self.assertGreaterEqual(event.total, sum(event.timings.values()))
+
+    def test_raw(self):
+        self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb', raw=True)
+
+        self.assertNotIn('model', self.events[0].timings)
+
+    def test_cache(self):
+        for _ in range(3):
+            self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb', cache=True)
+
+        self.assertEqual([event.cache for event in self.events], ['miss', 'hit', 'hit'])
+        self.assertNotIn('http', self.events[1].timings)
+        self.assertEqual(self.metrics.hits, 2)
+
+    def test_error(self):
+        with self.assertRaises(battlenet.CharacterNotFound):
+            self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'missing')
+
+        self.assertEqual(self.events[0].error, 'APIError')
+        self.assertEqual(self.metrics.errors, 1)
+
+    def test_throttle(self):
+        connection = battlenet.Connection(metrics=self.metrics, rate_limiter=False,
+                                          transport=ThrottledTransport([429, 200]))
+        connection.make_request(battlenet.EUROPE, '/character/tarren-mill/scobomb')
+
+        self.assertEqual(self.events[0].status, 200)
+        self.assertIn('throttle', self.events[0].timings)
+
+    def test_histograms(self):
+        for name in ('scobomb', 'clí', 'vishnevskiy'):
+            self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', name)
+
+        histogram = self.metrics.histogram('/character/tarren-mill/scobomb')
+        self.assertEqual(histogram.count, 3)
+        self.assertEqual(self.metrics.summary()['/character/{realm}/{name}']['decode']['count'], 3)
+        self.assertEqual(self.metrics.slowest()[0][0], '/character/{realm}/{name}')
+
+    def test_stream(self):
+        transport = FakeTransport({'realms': make_realms(100)}, chunk_size=1000)
+        connection = battlenet.Connection(metrics=self.metrics, rate_limiter=False, transport=transport)
+
+        realms = connection.iter_all_realms(battlenet.EUROPE, raw=True)
+        next(realms)
+        self.assertEqual(self.events, [])
+
+        self.assertEqual(len(list(realms)), 99)
+
+        event = self.events[0]
+        self.assertEqual(event.path, '/realm/status')
+        self.assertEqual(event.status, 200)
+        self.assertEqual(event.bytes, len(transport.response.content))
+        self.assertIsNone(event.error)
+        self.assertEqual(set(event.timings), set(['http', 'decode']))
+
+    def test_stream_closed(self):
+        connection = battlenet.Connection(metrics=self.metrics, rate_limiter=False,
+                                          transport=FakeTransport({'realms': make_realms(2)}))
+
+        realms = connection.iter_all_realms(battlenet.EUROPE, raw=True)
+        next(realms)
+        realms.close()
+
+        self.assertIsNone(self.events[0].error)
+
+    def test_failing_hook(self):
+        def hook(event):
+            raise RuntimeError
+
+        self.metrics.add_hook(hook)
+        self.connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb')
+
+        self.assertEqual(len(self.events), 1)
+
+    def test_disabled(self):
+        connection = battlenet.Connection(metrics=False, transport=CharacterTransport())
+
+        self.assertEqual(connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb').name, 'Scobomb')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from battlenet.pool import PooledAdapter
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledAdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.url = 'http://127.0.0.1:%d/' % self.server.server_address[1]
+        self.adapter = PooledAdapter(pool_maxsize=4)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reuse(self):
+        for _ in range(10):
+            self.session.get(self.url).json()
+
+        stats = self.adapter.stats.stats()
+
+        self.assertEqual(stats['requests'], 10)
+        self.assertEqual(stats['connections'], 1)
+        self.assertAlmostEqual(stats['reuse_ratio'], 0.9)
+        self.assertEqual(stats['open'], 1)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_threads(self):
+        def work():
+            for _ in range(5):
+                self.session.get(self.url).json()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.adapter.stats.stats()
+
+        self.assertEqual(stats['requests'], 20)
+        self.assertLessEqual(stats['connections'], 4)
+        self.assertLessEqual(stats['open'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import battlenet
+from battlenet import Character, Guild
+from tests.fakes import FakeTransport, FakeResponse, make_character, make_guild
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+REALMS = [{'name': 'Tarren Mill', 'slug': 'tarren-mill', 'status': True, 'queue': False,
+           'population': 'high', 'type': 'normal'}]
+
+
+class GraphTransport(FakeTransport):
+    """A guild of ``members`` characters, each field of a character being ``[field]``."""
+
+    def __init__(self, members=3):
+        super(GraphTransport, self).__init__()
+        self.members = members
+        self.missing = False
+
+    def respond(self, path, params, headers):
+        fields = params.get('fields') or []
+
+        if self.missing:
+            return FakeResponse({}, 404)
+
+        if path.startswith('/guild/'):
+            data = make_guild(members=self.members if Guild.MEMBERS in fields else None)
+        elif path.startswith('/realm/status'):
+            data = {'realms': REALMS}
+        else:
+            data = make_character(path.split('/')[-1].capitalize())
+            for field in fields:
+                data[field] = [field]
+
+        return FakeResponse(data)
+
+
+class PrefetchTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = GraphTransport()
+        self.connection = battlenet.Connection(transport=self.transport)
+        self.guild = Guild(battlenet.EUROPE, data=make_guild(), connection=self.connection)
+
+    def test_members(self):
+        self.connection.prefetch(self.guild, members=[Character.MOUNTS, Character.COMPANIONS], realms=True)
+        requests = len(self.transport.requests)
+
+        self.assertEqual(requests, 1 + 3 + 1)
+
+        for member in self.guild.members:
+            character = member['character']
+            self.assertEqual(character.mounts, [Character.MOUNTS])
+            self.assertEqual(character.companions, [Character.COMPANIONS])
+            self.assertEqual(character.realm.slug, 'tarren-mill')
+
+        self.assertEqual(len(self.transport.requests), requests)
+
+    def test_only_missing(self):
+        self.connection.prefetch(self.guild, members=[Character.MOUNTS])
+        self.connection.prefetch(self.guild, members=[Character.MOUNTS, Character.COMPANIONS])
+
+        character_requests = [sorted(request.params['fields']) for request in self.transport.requests
+                              if request.path.startswith('/character/')]
+
+        self.assertEqual(character_requests, [[Character.MOUNTS]] * 3 + [[Character.COMPANIONS]] * 3)
+
+    def test_characters(self):
+        characters = [Character(battlenet.EUROPE, data=make_character(), connection=self.connection)]
+        self.connection.prefetch(characters, fields=[Character.MOUNTS])
+
+        self.assertEqual(characters[0].mounts, [Character.MOUNTS])
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_not_found(self):
+        self.transport.missing = True
+
+        self.assertEqual(self.connection.prefetch(self.guild, members=[Character.PROGRESSION]), [self.guild])
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertNotIn(Guild.MEMBERS, self.guild._data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import battlenet
+from battlenet.ratelimit import TokenBucket, RateLimiter, retry_delay, parse_retry_after
+from tests.fakes import FakeTransport, FakeResponse
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class ThrottledTransport(FakeTransport):
+    """Answers with the next of ``statuses``, then 200."""
+
+    def __init__(self, statuses):
+        super(ThrottledTransport, self).__init__()
+        self.statuses = list(statuses)
+        self.responses = []
+
+    def respond(self, path, params, headers):
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.responses.append(FakeResponse({'realms': []}, status, {'Retry-After': '0'} if status == 429 else {}))
+        return self.responses[-1]
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+
+        started = time.time()
+        for _ in range(10):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.time() - started, 0.08)
+
+    def test_block(self):
+        bucket = TokenBucket(rate=1000)
+        bucket.block(0.05)
+
+        started = time.time()
+        bucket.acquire()
+
+        self.assertGreaterEqual(time.time() - started, 0.04)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_per_region(self):
+        limiter = RateLimiter(per_second=2, per_hour=None)
+
+        started = time.time()
+        limiter.acquire('client', battlenet.UNITED_STATES)
+        limiter.acquire('client', battlenet.UNITED_STATES)
+        limiter.acquire('client', battlenet.EUROPE)
+        limiter.acquire('client', battlenet.EUROPE)
+
+        self.assertLess(time.time() - started, 0.1)
+
+    def test_retry_delay(self):
+        for attempt in range(10):
+            self.assertLessEqual(retry_delay(attempt, base=0.5, cap=4), 4)
+
+        self.assertGreaterEqual(retry_delay(0, '2'), 2)
+        self.assertEqual(parse_retry_after('3'), 3)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after(None))
+
+
+class ConnectionThrottleTest(unittest.TestCase):
+    def make_connection(self, statuses, max_retries=3):
+        self.transport = ThrottledTransport(statuses)
+        return battlenet.Connection(max_retries=max_retries, transport=self.transport)
+
+    def test_retry(self):
+        connection = self.make_connection([429, 429])
+        connection.make_request(battlenet.EUROPE, '/realm/status')
+
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_stream_retry_closes_response(self):
+        connection = self.make_connection([429, 429])
+
+        self.assertEqual(list(connection.iter_all_realms(battlenet.EUROPE)), [])
+        self.assertEqual([r.closed for r in self.transport.responses], [True, True, True])
+
+    def test_rate_limited_is_not_not_found(self):
+        connection = self.make_connection([429] * 5, max_retries=2)
+
+        self.assertRaises(battlenet.RateLimitExceeded,
+            lambda: connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb'))
+
+    def test_not_found(self):
+        connection = self.make_connection([404])
+
+        try:
+            connection.get_character(battlenet.EUROPE, 'Tarren Mill', 'Scobomb')
+        except battlenet.CharacterNotFound as e:
+            self.assertEqual(e.status_code, 404)
+        else:
+            self.fail('CharacterNotFound not raised')
+
+if __name__ == '__main__':
+    unittest.main()
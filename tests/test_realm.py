@@ -4,8 +4,7 @@ import os
 import battlenet
 from battlenet import Realm
 from battlenet.utils import normalize
-from battlenet.utils import client_id
-from battlenet.utils import client_secret
+from battlenet.utils import make_connection
 
 try:
     import unittest2 as unittest
@@ -22,12 +21,8 @@ class RealmTest(unittest.TestCase):
         self.assertEqual(realm.name, name)
 
     def setUp(self):
-        self.connection = battlenet.Connection(
-            client_id=client_id(), client_secret=client_secret(),
-            locale='not-specified')
-        self.connection_en = battlenet.Connection(
-            client_id=client_id(), client_secret=client_secret(),
-            locale='en')
+        self.connection = make_connection(locale='not-specified')
+        self.connection_en = make_connection(locale='en')
 
     def test_realm_by_name(self):
         name = "Kil'jaeden"
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import battlenet
+from battlenet import Realm
+from battlenet.realms import RealmIndex
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+REALMS = [
+    {'name': "Kil'jaeden", 'slug': 'kiljaeden', 'status': True, 'queue': False,
+     'population': 'high', 'type': 'normal'},
+    {'name': 'Tarren Mill', 'slug': 'tarren-mill', 'status': True, 'queue': False,
+     'population': 'high', 'type': 'normal'},
+    {'name': '줄진', 'slug': 'zuljin', 'status': True, 'queue': False,
+     'population': 'high', 'type': 'normal'},
+]
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.requests = 0
+
+    def get_all_realms(self, region, raw=False):
+        self.requests += 1
+        return REALMS
+
+
+class RealmIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = FakeConnection()
+        self.index = RealmIndex(self.connection)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.get(battlenet.UNITED_STATES, "Kil'jaeden")['slug'], 'kiljaeden')
+        self.assertEqual(self.index.get(battlenet.UNITED_STATES, 'kiljaeden')['slug'], 'kiljaeden')
+        self.assertEqual(self.index.get(battlenet.UNITED_STATES, 'tarren mill')['slug'], 'tarren-mill')
+        self.assertEqual(self.index.get(battlenet.UNITED_STATES, 'tarren-mill')['slug'], 'tarren-mill')
+        self.assertEqual(self.index.get(battlenet.UNITED_STATES, '줄진')['slug'], 'zuljin')
+        self.assertIsNone(self.index.get(battlenet.UNITED_STATES, 'Fake Realm'))
+
+        self.assertEqual(self.connection.requests, 1)
+
+    def test_per_region(self):
+        self.index.get(battlenet.UNITED_STATES, 'kiljaeden')
+        self.index.get(battlenet.EUROPE, 'kiljaeden')
+
+        self.assertEqual(self.connection.requests, 2)
+
+    def test_expiry(self):
+        index = RealmIndex(self.connection, ttl=0)
+
+        index.get(battlenet.UNITED_STATES, 'kiljaeden')
+        index.get(battlenet.UNITED_STATES, 'kiljaeden')
+
+        self.assertEqual(self.connection.requests, 2)
+
+    def test_invalidate(self):
+        self.index.get(battlenet.UNITED_STATES, 'kiljaeden')
+        self.index.invalidate(battlenet.UNITED_STATES)
+        self.index.get(battlenet.UNITED_STATES, 'kiljaeden')
+
+        self.assertEqual(self.connection.requests, 2)
+
+    def test_connection(self):
+        connection = battlenet.Connection()
+        connection.realms.refresh(battlenet.UNITED_STATES, REALMS)
+
+        realm = Realm(battlenet.UNITED_STATES, "Kil'jaeden", connection=connection)
+        self.assertEqual(realm.slug, 'kiljaeden')
+        self.assertEqual(realm.region, battlenet.UNITED_STATES)
+
+        self.assertRaises(battlenet.RealmNotFound, lambda: connection.get_realm(battlenet.UNITED_STATES, 'Fake Realm'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import copy
+import time
+import asyncio
+import battlenet
+from battlenet.realms import RealmIndex, RealmStatusPoller
+from tests.test_realm_index import REALMS
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class StatusConnection(object):
+    def __init__(self):
+        self.realms = RealmIndex(self)
+        self.responses = {}
+        self.requests = 0
+
+    def get_all_realms(self, region, raw=False, cache=False):
+        self.requests += 1
+        return self.responses.setdefault(region, copy.deepcopy(REALMS))
+
+    def change(self, region, index, **values):
+        realms = copy.deepcopy(self.responses[region])
+        realms[index].update(values)
+        self.responses[region] = realms
+
+
+class RealmStatusPollerTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = StatusConnection()
+        self.changes = []
+        self.poller = RealmStatusPoller(self.connection, [battlenet.EUROPE, battlenet.KOREA],
+                                        callbacks=[self.changes.append])
+
+    def test_transitions(self):
+        self.assertEqual(self.poller.poll(), [])
+        self.assertEqual(self.poller.poll(), [])
+
+        self.connection.change(battlenet.EUROPE, 1, status=False, queue=True, type='pvp')
+        changes = self.poller.poll()
+
+        self.assertEqual(sorted((c.region, c.slug, c.field, c.old, c.new) for c in changes), [
+            (battlenet.EUROPE, 'tarren-mill', 'queue', False, True),
+            (battlenet.EUROPE, 'tarren-mill', 'status', True, False),
+        ])
+        self.assertEqual(self.changes, changes)
+        self.assertFalse(self.poller.get(battlenet.EUROPE, 'tarren-mill')['status'])
+        self.assertFalse(self.connection.realms.get(battlenet.EUROPE, 'Tarren Mill')['status'])
+
+    def test_added_and_removed(self):
+        self.poller.poll(battlenet.EUROPE)
+
+        realms = copy.deepcopy(REALMS[1:])
+        realms.append({'name': 'Draenor', 'slug': 'draenor', 'status': True, 'queue': False,
+                       'population': 'full', 'type': 'normal'})
+        self.connection.responses[battlenet.EUROPE] = realms
+
+        changes = self.poller.poll(battlenet.EUROPE)
+
+        self.assertEqual(sorted((c.slug, c.old is None, c.new is None) for c in changes), [
+            ('draenor', True, False),
+            ('kiljaeden', False, True),
+        ])
+
+    def test_background(self):
+        self.poller.interval = 0.01
+
+        with self.poller:
+            time.sleep(0.05)
+            self.connection.change(battlenet.KOREA, 0, population='low')
+            time.sleep(0.05)
+
+        self.assertEqual([(c.region, c.field, c.new) for c in self.changes], [(battlenet.KOREA, 'population', 'low')])
+        self.assertGreater(self.connection.requests, 4)
+
+    def test_asyncio_queue(self):
+        async def consume():
+            queue = self.poller.queue()
+            self.poller.poll()
+            self.connection.change(battlenet.EUROPE, 2, queue=True)
+            await asyncio.get_running_loop().run_in_executor(None, self.poller.poll)
+
+            return await asyncio.wait_for(queue.get(), 1)
+
+        change = asyncio.run(consume())
+
+        self.assertEqual((change.slug, change.field, change.new), ('zuljin', 'queue', True))
+
+if __name__ == '__main__':
+    unittest.main()
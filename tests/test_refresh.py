@@ -0,0 +1,51 @@
+import battlenet
+from battlenet import Character
+from tests.fakes import FakeTransport, FakeResponse, make_character
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+FIELDS = {
+    Character.MOUNTS: [1, 2, 3],
+    Character.COMPANIONS: [4, 5],
+    Character.STATISTICS: {'subCategories': []},
+}
+
+
+class FieldsTransport(FakeTransport):
+    def respond(self, path, params, headers):
+        return FakeResponse(make_character(**dict((field, FIELDS[field]) for field in params.get('fields') or [])))
+
+    @property
+    def requested(self):
+        return [sorted(request.params.get('fields') or []) for request in self.requests]
+
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = FieldsTransport()
+        self.connection = battlenet.Connection(transport=self.transport)
+        self.character = Character(battlenet.EUROPE, data=make_character(), connection=self.connection)
+
+    def test_only_missing_fields(self):
+        mounts = self.character.mounts
+        companions = self.character.companions
+        statistics = self.character.statistics
+
+        self.assertEqual(self.transport.requested, [[Character.MOUNTS], [Character.COMPANIONS], [Character.STATISTICS]])
+        self.assertIs(self.character.mounts, mounts)
+        self.assertIs(self.character.companions, companions)
+        self.assertIs(self.character.statistics, statistics)
+
+    def test_full_refresh(self):
+        self.character.mounts
+        self.character.companions
+        self.character.refresh()
+
+        self.assertEqual(self.transport.requested[-1], sorted([Character.MOUNTS, Character.COMPANIONS]))
+
+if __name__ == '__main__':
+    unittest.main()
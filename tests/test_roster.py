@@ -0,0 +1,88 @@
+import copy
+import battlenet
+from battlenet import Character
+from battlenet.roster import RosterTracker, JOIN, LEAVE, RANK, LEVEL, ACHIEVEMENT_POINTS
+from tests.fakes import FakeTransport, FakeResponse, make_guild
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class GuildTransport(FakeTransport):
+    """Answers 304 when the ``data`` returned last is still current."""
+
+    def respond(self, path, params, headers):
+        etag = '"v%d"' % id(self.data)
+
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(status_code=304)
+
+        return FakeResponse(self.data, headers={'ETag': etag})
+
+
+class RosterTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.guild = make_guild(members=100)
+        self.transport = GuildTransport(self.guild)
+        self.connection = battlenet.Connection(rate_limiter=False, transport=self.transport)
+        self.tracker = RosterTracker(battlenet.EUROPE, 'Tarren Mill', 'Excellence', connection=self.connection)
+
+    def test_first_update(self):
+        self.assertEqual(self.tracker.update(self.guild['members']), [])
+        self.assertEqual(len(self.tracker), 100)
+
+    def test_changes(self):
+        self.tracker.update(self.guild['members'])
+
+        members = copy.deepcopy(self.guild['members'])
+        left = members.pop(0)
+        members[0]['rank'] += 1
+        members[1]['character']['level'] += 1
+        members[1]['character']['achievementPoints'] += 10
+        members.append({'character': dict(left['character'], name='Newcomer'), 'rank': 9})
+
+        changes = self.tracker.update(members)
+        summary = sorted((change.kind, change.character.name, change.old, change.new) for change in changes)
+
+        self.assertEqual(summary, sorted([
+            (RANK, members[0]['character']['name'], members[0]['rank'] - 1, members[0]['rank']),
+            (LEVEL, members[1]['character']['name'], members[1]['character']['level'] - 1,
+             members[1]['character']['level']),
+            (ACHIEVEMENT_POINTS, members[1]['character']['name'], members[1]['character']['achievementPoints'] - 10,
+             members[1]['character']['achievementPoints']),
+            (JOIN, 'Newcomer', None, 9),
+            (LEAVE, left['character']['name'], left['rank'], None),
+        ]))
+        self.assertIsInstance(changes[0].character, Character)
+
+        self.assertEqual(self.tracker.update(copy.deepcopy(members)), [])
+
+    def test_raw_and_callbacks(self):
+        received = []
+        tracker = RosterTracker(battlenet.EUROPE, 'Tarren Mill', 'Excellence', connection=self.connection, raw=True,
+                                callbacks=[received.append])
+        tracker.update(self.guild['members'])
+
+        members = copy.deepcopy(self.guild['members'])
+        members[5]['rank'] += 1
+        tracker.update(members)
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].kind, RANK)
+        self.assertEqual(received[0].character, members[5]['character'])
+
+    def test_poll_unchanged(self):
+        self.assertEqual(self.tracker.poll(), [])
+        self.assertEqual(self.tracker.poll(), [])
+        self.assertEqual(len(self.transport.requests), 2)
+
+        self.transport.data = copy.deepcopy(self.guild)
+        self.transport.data['members'][0]['rank'] += 1
+
+        changes = self.tracker.poll()
+        self.assertEqual([change.kind for change in changes], [RANK])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import battlenet
+from battlenet import Character
+from tests.fakes import load_fixture
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class SlotsTest(unittest.TestCase):
+    def setUp(self):
+        self.character = Character(battlenet.EUROPE, data=load_fixture('character.json'),
+                                   connection=battlenet.Connection())
+
+    def test_no_instance_dict(self):
+        for obj in (self.character, self.character.equipment, self.character.equipment.head, self.character.stats):
+            self.assertFalse(hasattr(obj, '__dict__'), type(obj).__name__)
+
+    def test_public_attributes(self):
+        head = self.character.equipment.head
+
+        self.assertEqual(self.character.name, 'Scobomb')
+        self.assertIsInstance(self.character.stats.agility, int)
+        self.assertIsInstance(head.itemLevel, int)
+        self.assertIsNotNone(head.gems[0])
+        self.assertIsNone(head.gems[3])
+        self.assertEqual(self.character.equipment['head'], head)
+
+    def test_lazy_equipment(self):
+        equipment = self.character.equipment
+
+        self.assertIsInstance(equipment.average_item_level, int)
+        self.assertFalse(hasattr(equipment, '_head'))
+
+        head = equipment.head
+        self.assertIs(equipment.head, head)
+        self.assertFalse(hasattr(equipment, '_neck'))
+        self.assertIsNone(equipment.ranged)
+
+    def test_lazy_item(self):
+        head = self.character.equipment.head
+
+        self.assertFalse(hasattr(head, '_gems'))
+        self.assertIs(head.gems, head.gems)
+        self.assertEqual(len(head.azeriteEmpoweredItem), 4)
+        self.assertEqual(head.azeriteLevel, 0)
+        self.assertIsNotNone(head.enchant)
+
+    def test_missing_field(self):
+        equipment = self.character.equipment
+        del equipment._data['averageItemLevel']
+
+        self.assertFalse(hasattr(equipment, 'average_item_level'))
+        self.assertIsNone(getattr(equipment, 'average_item_level', None))
+        with self.assertRaises(IndexError):
+            equipment['average_item_level']
+
+if __name__ == '__main__':
+    unittest.main()
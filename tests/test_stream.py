@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import json
+import battlenet
+from battlenet import Guild
+from battlenet.stream import iter_array
+from tests.fakes import FakeTransport, make_guild, make_realms
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterArrayTest(unittest.TestCase):
+    DOCUMENT = {
+        'name': u'Les Éclaireurs',
+        'skipped': {'nested': [1, [2, {'a': ']'}]], 'text': u'}"\\'},
+        'members': [
+            {'character': {'name': u'Älwyn', 'level': 120}, 'rank': 0},
+            {'character': {'name': 'Bob', 'level': 12345678901}, 'rank': -1.5e3},
+            [],
+            None,
+            'string',
+            42,
+        ],
+        'after': True,
+    }
+
+    def test_every_split(self):
+        data = json.dumps(self.DOCUMENT, ensure_ascii=False).encode('utf-8')
+        expected = self.DOCUMENT['members']
+
+        for position in range(len(data) + 1):
+            self.assertEqual(list(iter_array([data[:position], data[position:]], 'members')), expected)
+
+    def test_small_chunks(self):
+        data = json.dumps(self.DOCUMENT, ensure_ascii=False).encode('utf-8')
+
+        for size in (1, 2, 3, 7):
+            self.assertEqual(list(iter_array(chunked(data, size), 'members')), self.DOCUMENT['members'])
+
+    def test_text_chunks(self):
+        data = json.dumps(self.DOCUMENT, indent=4)
+
+        self.assertEqual(list(iter_array(chunked(data, 5), 'members')), self.DOCUMENT['members'])
+
+    def test_split_numbers(self):
+        data = b'{"members": [1.5, -2e3, 3E-2, 0.25e+1, 12345, true, null], "after": 1.5}'
+        expected = [1.5, -2e3, 3E-2, 0.25e+1, 12345, True, None]
+
+        for position in range(len(data) + 1):
+            self.assertEqual(list(iter_array([data[:position], data[position:]], 'members')), expected)
+
+        self.assertEqual(list(iter_array([b'{"members": [1.', b'5, 2]}'], 'members')), [1.5, 2])
+        self.assertEqual(list(iter_array([b'{"members": [1e', b'3 ]}'], 'members')), [1e3])
+
+    def test_missing_key(self):
+        self.assertEqual(list(iter_array([b'{"realms": [1, 2]}'], 'members')), [])
+
+    def test_empty(self):
+        self.assertEqual(list(iter_array([b'{"members": [ ]}'], 'members')), [])
+
+    def test_stops_at_array_end(self):
+        self.assertEqual(list(iter_array([b'{"members": [1, 2]', b', "broken'], 'members')), [1, 2])
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_array([b'{"members": 3}'], 'members'))
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            list(iter_array([b'{"members": [1, {"a"'], 'members'))
+
+
+class StreamConnectionTest(unittest.TestCase):
+    def connect(self, data):
+        self.transport = FakeTransport(data, chunk_size=1000)
+        return battlenet.Connection(transport=self.transport)
+
+    def test_iter_guild_members(self):
+        connection = self.connect(make_guild(members=200))
+
+        members = list(connection.iter_guild_members(battlenet.EUROPE, 'Tarren Mill', 'Excellence'))
+
+        self.assertEqual(len(members), 200)
+        self.assertIsInstance(members[0]['character'], battlenet.Character)
+        self.assertTrue(self.transport.requests[0].stream)
+        self.assertEqual(self.transport.requests[0].params['fields'], [Guild.MEMBERS])
+        self.assertTrue(self.transport.response.closed)
+
+    def test_guild_iter_members(self):
+        connection = self.connect(make_guild(members=50))
+
+        guild = Guild(battlenet.EUROPE, data=make_guild(), connection=connection)
+        members = list(guild.iter_members())
+
+        self.assertEqual(len(members), 50)
+        self.assertIs(members[0]['character']._guild, guild)
+        self.assertNotIn(Guild.MEMBERS, guild._data)
+
+    def test_iter_all_realms(self):
+        connection = self.connect({'realms': make_realms(40)})
+
+        realms = list(connection.iter_all_realms(battlenet.EUROPE))
+
+        self.assertEqual(len(realms), 40)
+        self.assertIsInstance(realms[0], battlenet.Realm)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import time
+import asyncio
+import shutil
+import tempfile
+import threading
+import battlenet
+from battlenet.tokens import TokenManager, MIN_REFRESH_DELAY
+from oauthlib.oauth2.rfc6749.errors import MissingTokenError
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class CountingTokenManager(TokenManager):
+    def __init__(self, *args, **kwargs):
+        super(CountingTokenManager, self).__init__(*args, **kwargs)
+        self.fetches = 0
+
+    def fetch_token(self, region):
+        self.fetches += 1
+        time.sleep(0.05)
+        return {'access_token': 'token-%d' % self.fetches, 'expires_in': self.expires_in,
+                'client_id': self.client_id}
+
+
+class TokenManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_manager(self, expires_in=3600, **kwargs):
+        manager = CountingTokenManager('id', 'secret', **kwargs)
+        manager.expires_in = expires_in
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_single_fetch(self):
+        manager = self.make_manager()
+        tokens = []
+
+        threads = [threading.Thread(target=lambda: tokens.append(manager.get_token(battlenet.EUROPE)))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(manager.fetches, 1)
+        self.assertEqual(set(tokens), set(['token-1']))
+
+    def test_async(self):
+        manager = self.make_manager()
+
+        self.assertEqual(asyncio.run(manager.get_token_async(battlenet.EUROPE)), 'token-1')
+        self.assertEqual(asyncio.run(manager.get_token_async(battlenet.EUROPE)), 'token-1')
+        self.assertEqual(manager.fetches, 1)
+
+    def test_background_refresh(self):
+        manager = self.make_manager(expires_in=0.2, refresh_margin=0.15)
+
+        self.assertEqual(manager.get_token(battlenet.EUROPE), 'token-1')
+        time.sleep(0.15)
+
+        self.assertEqual(manager.fetches, 2)
+        self.assertEqual(manager.get_token(battlenet.EUROPE), 'token-2')
+
+    def test_short_lived(self):
+        manager = self.make_manager(expires_in=60)
+        manager.get_token(battlenet.EUROPE)
+
+        self.assertAlmostEqual(manager._timers[battlenet.EUROPE].interval, 30, delta=1)
+
+        manager.set_token(battlenet.EUROPE, {'access_token': 'expired', 'expires_in': 0})
+        self.assertEqual(manager._timers[battlenet.EUROPE].interval, MIN_REFRESH_DELAY)
+        self.assertEqual(manager.fetches, 1)
+
+    def test_background_failure(self):
+        manager = self.make_manager(retry_delay=0.05)
+        fetch_token = manager.fetch_token
+
+        def failing(region):
+            if manager.fetches == 0:
+                manager.fetches += 1
+                raise MissingTokenError()
+            return fetch_token(region)
+
+        manager.fetch_token = failing
+
+        with self.assertLogs('battlenet', 'WARNING'):
+            manager._refresh_in_background(battlenet.EUROPE)
+        self.assertEqual(manager._timers[battlenet.EUROPE].interval, 0.05)
+
+        time.sleep(0.2)
+        self.assertEqual(manager.get_token(battlenet.EUROPE), 'token-2')
+        self.assertEqual(manager.fetches, 2)
+
+    def test_persist(self):
+        path = os.path.join(self.directory, 'tokens.json')
+
+        manager = self.make_manager(path=path)
+        manager.get_token(battlenet.EUROPE)
+
+        manager = self.make_manager(path=path)
+        self.assertEqual(manager.get_token(battlenet.EUROPE), 'token-1')
+        self.assertEqual(manager.fetches, 0)
+
+    def test_shared(self):
+        self.assertIs(TokenManager.shared('a', 'b'), TokenManager.shared('a', 'b'))
+        self.assertIsNot(TokenManager.shared('a', 'b'), TokenManager.shared('a', 'c'))
+
+        self.assertIs(battlenet.Connection('a', 'b').token_manager, battlenet.Connection('a', 'b').token_manager)
+
+if __name__ == '__main__':
+    unittest.main()
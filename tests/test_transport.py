@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import battlenet
+from battlenet import Character
+from battlenet.transport import RecordingTransport, ReplayTransport, FixtureNotFound
+from battlenet.utils import make_connection
+from tests.fakes import CharacterTransport
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest as unittest
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def record(self, *names):
+        connection = battlenet.Connection(transport=RecordingTransport(self.directory, CharacterTransport()))
+
+        return [connection.get_character(battlenet.EUROPE, 'tarren-mill', name, fields=[Character.ITEMS])
+                for name in names]
+
+    def test_replay(self):
+        recorded = self.record('scobomb', 'vishnevskiy')
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+        connection = battlenet.Connection(transport=ReplayTransport(self.directory), rate_limiter=False)
+        for character in recorded:
+            replayed = connection.get_character(battlenet.EUROPE, 'tarren-mill', character.name,
+                                                fields=[Character.ITEMS])
+            self.assertEqual(replayed._data, character._data)
+
+    def test_record_model_fields(self):
+        connection = battlenet.Connection(transport=RecordingTransport(self.directory, CharacterTransport()))
+        character = Character(battlenet.EUROPE, 'tarren-mill', 'scobomb', fields=[Character.STATS, Character.ITEMS],
+                              connection=connection)
+
+        connection = battlenet.Connection(transport=ReplayTransport(self.directory), rate_limiter=False)
+        replayed = Character(battlenet.EUROPE, 'tarren-mill', 'scobomb', fields=[Character.ITEMS, Character.STATS],
+                             connection=connection)
+
+        self.assertEqual(replayed._data, character._data)
+
+    def test_replay_error(self):
+        with self.assertRaises(battlenet.CharacterNotFound):
+            self.record('missing')
+
+        connection = battlenet.Connection(transport=ReplayTransport(self.directory), rate_limiter=False)
+        with self.assertRaises(battlenet.CharacterNotFound) as context:
+            connection.get_character(battlenet.EUROPE, 'tarren-mill', 'missing', fields=[Character.ITEMS])
+
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_not_recorded(self):
+        self.record('scobomb')
+
+        connection = battlenet.Connection(transport=ReplayTransport(self.directory), rate_limiter=False)
+        with self.assertRaises(FixtureNotFound):
+            connection.get_character(battlenet.EUROPE, 'tarren-mill', 'scobomb')
+
+    def test_stream_replay(self):
+        self.record('scobomb')
+
+        connection = battlenet.Connection(transport=ReplayTransport(self.directory), rate_limiter=False)
+        session = connection._get_client(battlenet.EUROPE)
+        url = battlenet.connection.URL_FORMAT.format(region='eu', game='wow',
+                                                     path='/character/tarren-mill/scobomb')
+        response = session.get(url, params={'fields': [Character.ITEMS], 'locale': connection.locale})
+
+        self.assertEqual(b''.join(response.iter_content(7)), response.content)
+
+    def test_make_connection(self):
+        os.environ['BNET_REPLAY_DIR'] = self.directory
+        try:
+            connection = make_connection()
+        finally:
+            del os.environ['BNET_REPLAY_DIR']
+
+        self.assertIsInstance(connection.transport, ReplayTransport)
+        self.assertFalse(connection.rate_limiter)
+
+if __name__ == '__main__':
+    unittest.main()